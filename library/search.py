@@ -5,9 +5,11 @@ Programm zur Suche im Online-Katalog der Stadtbibliothek Köln
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import urllib.parse
 import re
+import functools
 from difflib import SequenceMatcher
 import time
 import random
@@ -16,11 +18,46 @@ from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
-
+# Vorkompilierte Muster für die Autorenprüfung (einmal pro Modul statt pro Aufruf)
+_PERSON_FIELD_RE = re.compile(
+    r"Person\(en\)\s*:\s*(.+?)(?:\s+(?:Erschienen|Umfang|Ausgabe|Anmerkungen|Original|FSK|Sprachen|ISMN|EAN|Notation|Bestand)|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+_NON_WORD_RE = re.compile(r"[^\w\s]+")
+_BRACKETS_RE = re.compile(r"\[.*?\]")
+_NAME_CANDIDATE_RE = re.compile(r"\b([A-ZÄÖÜ][a-zäöüß]+(?:\s+[A-ZÄÖÜ][a-zäöüß]+)*)\b")
+
+# Rollen-Angaben im Person(en)-Feld; werden nacheinander in dieser
+# Reihenfolge entfernt, daher ein Muster pro Rolle
+_PERSON_ROLES = (
+    "Regisseur",
+    "Schauspieler",
+    "Darsteller",
+    "Komponist",
+    "Interpret",
+    "Verfasser",
+    "Autor",
+    "Herausgeber",
+    "Sonstige",
+    "Mitwirkende",
+    "Mitwirkender",
+)
+_ROLE_RES = tuple(re.compile(rf"\s+{role}\s*", re.IGNORECASE) for role in _PERSON_ROLES)
+
+# Gleichzeitig offen gehaltene Verbindungen zum Katalogserver; muss mindestens
+# so groß sein wie die Zahl paralleler Suchen im Recommender
+HTTP_POOL_SIZE = 10
+
+
+@functools.lru_cache(maxsize=4096)
 def normalize_name(name: str) -> str:
     """
     Normalisiert einen Namen für besseren Vergleich.
 
+    Ergebnisse werden zwischengespeichert, da dieselben Namen in vielen
+    Suchergebnissen wiederkehren.
+
     Args:
         name: Zu normalisierender Name
 
@@ -40,12 +77,8 @@ def normalize_name(name: str) -> str:
         parts = name.split(",", 1)
         name = f"{parts[1].strip()} {parts[0].strip()}"
 
-    # Lowercase und Sonderzeichen entfernen
-    name = name.lower().strip()
-    name = re.sub(r"[^\w\s]", " ", name)
-    name = re.sub(r"\s+", " ", name)
-
-    return name
+    # Lowercase, Sonderzeichen entfernen, Leerzeichen zusammenfassen
+    return " ".join(_NON_WORD_RE.sub(" ", name.lower()).split())
 
 
 def calculate_name_similarity(name1: str, name2: str) -> float:
@@ -68,9 +101,6 @@ def calculate_name_similarity(name1: str, name2: str) -> float:
     if name1 == name2:
         return 1.0
 
-    # SequenceMatcher für Gesamtähnlichkeit
-    sequence_score = SequenceMatcher(None, name1, name2).ratio()
-
     # Wort-basierter Vergleich
     words1_list = name1.split()
     words2_list = name2.split()
@@ -79,12 +109,15 @@ def calculate_name_similarity(name1: str, name2: str) -> float:
     words2 = set(words2_list)
 
     if not words1 or not words2:
-        return sequence_score
+        return SequenceMatcher(None, name1, name2).ratio()
 
-    # Jaccard-Ähnlichkeit
-    intersection = len(words1.intersection(words2))
-    union = len(words1.union(words2))
-    word_score = intersection / union if union > 0 else 0.0
+    # Jaccard-Ähnlichkeit; disjunkte Wortmengen (der häufigste Fall) ohne
+    # Schnittmenge prüfen, die Vereinigung ergibt sich aus den Mengengrößen
+    if words1.isdisjoint(words2):
+        word_score = 0.0
+    else:
+        intersection = len(words1 & words2)
+        word_score = intersection / (len(words1) + len(words2) - intersection)
 
     # Substring-Match
     substring_score = 0.0
@@ -117,12 +150,54 @@ def calculate_name_similarity(name1: str, name2: str) -> float:
     # Kombiniere Scores
     if abbreviation_score > 0:
         # Bei Abkürzungen: Verwende reduzierten Score
-        final_score = abbreviation_score
-    else:
-        # Normal: Verwende gewichteten Durchschnitt
-        final_score = max(sequence_score * 0.3 + word_score * 0.4 + substring_score * 0.3, lastname_score, substring_score)
+        return abbreviation_score
 
-    return final_score
+    # Normal: Verwende gewichteten Durchschnitt
+    partial_score = word_score * 0.4 + substring_score * 0.3
+    best_other = max(lastname_score, substring_score)
+
+    # SequenceMatcher ist der teuerste Teil. Seine Schranken (1.0,
+    # real_quick_ratio, quick_ratio) sind obere Grenzen für ratio(); kann der
+    # gewichtete Durchschnitt selbst damit best_other nicht übertreffen,
+    # entfällt die genaue Berechnung, das Ergebnis bleibt identisch
+    if partial_score + 0.3 <= best_other:
+        return best_other
+
+    matcher = SequenceMatcher(None, name1, name2)
+    if partial_score + matcher.real_quick_ratio() * 0.3 <= best_other:
+        return best_other
+    if partial_score + matcher.quick_ratio() * 0.3 <= best_other:
+        return best_other
+
+    # SequenceMatcher für Gesamtähnlichkeit
+    sequence_score = matcher.ratio()
+
+    return max(sequence_score * 0.3 + word_score * 0.4 + substring_score * 0.3, lastname_score, substring_score)
+
+
+def _can_reach_threshold(expected_norm: str, expected_lastname: str, candidate_norm: str, threshold: float) -> bool:
+    """
+    Günstige Vorprüfung, ob calculate_name_similarity den Schwellwert erreichen kann.
+
+    Ab einem Schwellwert von 0.7 ist ein Treffer nur über gleiche Nachnamen,
+    einen Substring-Match oder identische Wortmengen möglich. In allen Fällen
+    kommt der erwartete Nachname im Kandidaten vor oder der Kandidat ist Teil
+    des erwarteten Namens. Alles andere kann ohne Ähnlichkeitsberechnung
+    verworfen werden.
+
+    Args:
+        expected_norm: Erwarteter Name (normalisiert)
+        expected_lastname: Letztes Wort des erwarteten Namens
+        candidate_norm: Zu prüfender Name (normalisiert)
+        threshold: Mindest-Ähnlichkeit
+
+    Returns:
+        False nur wenn der Schwellwert sicher nicht erreicht wird
+    """
+    if threshold < 0.7 or not candidate_norm:
+        return True
+
+    return expected_lastname in candidate_norm or candidate_norm in expected_norm
 
 
 def extract_person_field(availability_text: str) -> List[str]:
@@ -149,8 +224,7 @@ def extract_person_field(availability_text: str) -> List[str]:
 
     # GEFIXT: Pattern muss auch mit Leerzeichen statt Zeilenumbrüchen funktionieren
     # Suche nach "Person(en) :" bis zum nächsten großgeschriebenen Feld
-    pattern = r"Person\(en\)\s*:\s*(.+?)(?:\s+(?:Erschienen|Umfang|Ausgabe|Anmerkungen|Original|FSK|Sprachen|ISMN|EAN|Notation|Bestand)|$)"
-    match = re.search(pattern, availability_text, re.IGNORECASE | re.DOTALL)
+    match = _PERSON_FIELD_RE.search(availability_text)
 
     if not match:
         logger.debug("    ⚠️ Person(en)-Feld nicht im Text gefunden")
@@ -161,7 +235,7 @@ def extract_person_field(availability_text: str) -> List[str]:
     logger.debug(f"    ✓ Person(en) Rohtext gefunden ({len(persons_text)} Zeichen): '{persons_text[:150]}'")
 
     # WICHTIG: Ersetze alle Whitespace-Kombinationen durch einzelnes Leerzeichen
-    persons_text = re.sub(r"\s+", " ", persons_text)
+    persons_text = _WHITESPACE_RE.sub(" ", persons_text)
     logger.debug(f"    Normalisiert: '{persons_text[:150]}'")
 
     # Teile bei Semikolon (mehrere Personen)
@@ -170,30 +244,15 @@ def extract_person_field(availability_text: str) -> List[str]:
 
     persons = []
     for idx, person_part in enumerate(parts, 1):
-        # Entferne Rollen-Angaben
-        roles = [
-            "Regisseur",
-            "Schauspieler",
-            "Darsteller",
-            "Komponist",
-            "Interpret",
-            "Verfasser",
-            "Autor",
-            "Herausgeber",
-            "Sonstige",
-            "Mitwirkende",
-            "Mitwirkender",
-        ]
-
         person = person_part.strip()
         original = person
 
         # Entferne alle Rollen-Angaben
-        for role in roles:
-            person = re.sub(rf"\s+{role}\s*", "", person, flags=re.IGNORECASE)
+        for role_re in _ROLE_RES:
+            person = role_re.sub("", person)
 
         # Entferne auch eckige Klammern
-        person = re.sub(r"\[.*?\]", "", person).strip()
+        person = _BRACKETS_RE.sub("", person).strip()
         person = person.strip(" ,;")
 
         if person:
@@ -206,6 +265,39 @@ def extract_person_field(availability_text: str) -> List[str]:
     return persons
 
 
+def _normalized_candidates(result: Dict[str, Any], availability_text: str) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Gibt die normalisierten Namenskandidaten eines Suchergebnisses zurück.
+
+    Personen aus dem Person(en)-Feld und Namens-Muster aus dem Volltext
+    werden einmal extrahiert und normalisiert und im Ergebnis unter
+    "_normalized_candidates" abgelegt. Wiederholte Prüfungen desselben
+    Ergebnisses (z.B. aus dem Such-Cache) greifen darauf zurück, solange
+    sich der Verfügbarkeitstext nicht geändert hat.
+
+    Args:
+        result: Suchergebnis-Dictionary
+        availability_text: Verfügbarkeitstext des Ergebnisses
+
+    Returns:
+        Dictionary mit "persons" und "full_text", jeweils Liste von
+        (Originalname, normalisierter Name)
+    """
+    cached = result.get("_normalized_candidates")
+    if cached is not None and cached[0] == availability_text:
+        return cached[1]
+
+    persons = extract_person_field(availability_text)
+    potential_names = _NAME_CANDIDATE_RE.findall(availability_text)[:10]  # Nur erste 10 prüfen
+
+    candidates: Dict[str, List[Tuple[str, str]]] = {
+        "persons": [(person, normalize_name(person)) for person in persons],
+        "full_text": [(name, normalize_name(name)) for name in potential_names],
+    }
+    result["_normalized_candidates"] = (availability_text, candidates)
+    return candidates
+
+
 def check_author_match(result: Dict[str, Any], expected_author: str, threshold: float = 0.7) -> Tuple[bool, float, str]:
     """
     Prüft ob ein Suchergebnis zum erwarteten Autor/Künstler/Regisseur passt.
@@ -232,6 +324,7 @@ def check_author_match(result: Dict[str, Any], expected_author: str, threshold:
         return (True, 1.0, "no_author_specified")
 
     expected_norm = normalize_name(expected_author)
+    expected_lastname = expected_norm.rsplit(" ", 1)[-1]
     availability_text = result.get("zentralbibliothek_info", "")
     title = result.get("title", "")
 
@@ -241,18 +334,22 @@ def check_author_match(result: Dict[str, Any], expected_author: str, threshold:
     logger.debug(f"  Titel: '{title}'")
     logger.debug(f"  Verfügbarkeitstext vorhanden: {len(availability_text)} Zeichen")
 
+    candidates = _normalized_candidates(result, availability_text)
+
     # Strategie 1: Person(en)-Feld - ALLE Personen prüfen
     logger.debug("  📋 Strategie 1: Person(en)-Feld")
-    # Strategie 1: Person(en)-Feld - ALLE Personen prüfen
-    persons = extract_person_field(availability_text)
+    persons = candidates["persons"]
 
     if persons:
         logger.debug(f"  ➡️ {len(persons)} Person(en) gefunden")
         best_person_score = 0.0
         best_person_name = None
 
-        for person in persons:
-            person_norm = normalize_name(person)
+        for person, person_norm in persons:
+            if not _can_reach_threshold(expected_norm, expected_lastname, person_norm, threshold):
+                logger.debug(f"    • '{person}' übersprungen (Nachname '{expected_lastname}' fehlt)")
+                continue
+
             similarity = calculate_name_similarity(expected_norm, person_norm)
 
             logger.debug(f"    • '{person}'")
@@ -277,16 +374,17 @@ def check_author_match(result: Dict[str, Any], expected_author: str, threshold:
     logger.debug("  📋 Strategie 2: Volltext-Suche")
     if availability_text:
         # Suche nach Namen-Pattern
-        name_pattern = r"\b([A-ZÄÖÜ][a-zäöüß]+(?:\s+[A-ZÄÖÜ][a-zäöüß]+)*)\b"
-        potential_names = re.findall(name_pattern, availability_text)
+        potential_names = candidates["full_text"]
 
-        logger.debug(f"  ➡️ {len(potential_names)} potentielle Namen gefunden")
+        logger.debug(f"  ➡️ {len(potential_names)} potentielle Namen geprüft")
 
         best_similarity = 0.0
         best_match = None
 
-        for potential_name in potential_names[:10]:  # Nur erste 10 zeigen
-            potential_norm = normalize_name(potential_name)
+        for potential_name, potential_norm in potential_names:
+            if not _can_reach_threshold(expected_norm, expected_lastname, potential_norm, threshold):
+                continue
+
             similarity = calculate_name_similarity(expected_norm, potential_norm)
 
             if similarity > 0.3:  # Nur relevante zeigen
@@ -350,6 +448,9 @@ def filter_results_by_author(
 
     filtered_results = []
 
+    # Erwarteter Titel ist für alle Ergebnisse gleich, nur einmal normalisieren
+    expected_title_norm = normalize_name(expected_title) if expected_title else ""
+
     for i, result in enumerate(results, 1):
         logger.info(f"\n--- Ergebnis {i}/{len(results)} ---")
         logger.info(f"Titel: '{result.get('title', 'KEIN TITEL')}'")
@@ -361,7 +462,6 @@ def filter_results_by_author(
         title_similarity = 0.0
         if expected_title and result.get("title"):
             result_title_norm = normalize_name(result["title"])
-            expected_title_norm = normalize_name(expected_title)
             title_similarity = calculate_name_similarity(expected_title_norm, result_title_norm)
             logger.info(f"📝 Titel-Match: '{result['title']}' -> Score: {title_similarity:.2f}")
 
@@ -405,11 +505,29 @@ def filter_results_by_author(
 class KoelnLibrarySearch:
     """Suchengine für die Stadtbibliothek Köln."""
 
-    def __init__(self) -> None:
-        """Initialisiert die Suchengine mit Basis-URLs und Session."""
+    def __init__(self, session: Optional[requests.Session] = None) -> None:
+        """
+        Initialisiert die Suchengine mit Basis-URLs und Session.
+
+        Alle Anfragen laufen über eine gemeinsame Session, deren
+        Keep-Alive-Verbindungen wiederverwendet werden.
+
+        Args:
+            session: Optionale bestehende Session, die mitgenutzt wird.
+                Ohne Angabe wird eine eigene Session mit Verbindungspool
+                erstellt, die close() wieder schließt.
+        """
         self.base_url: str = "https://katalog.stbib-koeln.de"
         self.search_url: str = f"{self.base_url}/alswww2.dll/APS_ZONES"
-        self.session: requests.Session = requests.Session()
+        self._owns_session: bool = session is None
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+
+        self.session: requests.Session = session
         self.session.headers.update(
             {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -418,6 +536,17 @@ class KoelnLibrarySearch:
             }
         )
 
+    def close(self) -> None:
+        """Schließt die Session, sofern sie von dieser Instanz erstellt wurde."""
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self) -> "KoelnLibrarySearch":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def advanced_search(
         self,
         title: Optional[str] = None,
@@ -6,9 +6,14 @@ Dieses Modul stellt sicher, dass Empfehlungen gleichmäßig aus allen verfügbar
 Datenquellen stammen (z.B. 4 Filme von BBC, 4 von FBW, 4 von Oscar).
 """
 
-import re
-from typing import List, Dict, Any, Optional
-from collections import defaultdict
+import logging
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+from collections import defaultdict, deque
 from .state import AppState
 from utils.blacklist import get_blacklist, Blacklist
 from utils.logging_config import get_logger
@@ -17,6 +22,29 @@ from library.search import filter_results_by_author
 
 logger = get_logger(__name__)
 
+# Anzahl paralleler Bibliotheksanfragen (Netzwerk-I/O gibt den GIL frei)
+SEARCH_WORKERS = 8
+
+# Höchstens so viele Katalogsuchen pro gewünschtem Item einer Quelle
+# (items_per_source * Faktor), begrenzt die Anfragen bei großen Listen mit
+# wenig verfügbaren Titeln; Standardwert für candidate_oversample
+CANDIDATE_OVERSAMPLE = 5
+
+# Zwischenspeicher für Katalogsuchen: Gültigkeit und maximale Größe
+SEARCH_CACHE_TTL_SECONDS = 3600
+SEARCH_CACHE_MAX_SIZE = 10_000
+
+# Kennzeichen im Verfügbarkeitstext (bereits casefold)
+_AVAILABLE_MARKER = "verfügbar".casefold()
+_BORROWED_MARKER = "entliehen".casefold()
+
+# Kürzel für Filme im Verfügbarkeitstext (Groß-/Kleinschreibung beachten, ohne Wortgrenzen)
+_FILM_MARKER = "Uv"
+
+# Aufbau der Katalogsuche je Medientyp
+_QUERY_TEMPLATES: Dict[str, str] = {"Buch": "{author} {title} {type}"}
+_DEFAULT_QUERY_TEMPLATE = "{title} {author} {type}"
+
 
 class Recommender:
     """
@@ -42,6 +70,13 @@ class Recommender:
         self.state: AppState = state
         self.blacklist: Blacklist = get_blacklist()
 
+        # Thread-Pool für vorausschauende Bibliotheksanfragen
+        self._pool = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="library-search")
+
+        # Suchergebnisse pro Anfrage: {query_lower: (zeitstempel, treffer)}
+        self._search_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._search_cache_lock = threading.Lock()
+
         # Tracking für Quellen-Balance pro Kategorie
         self.source_counts: Dict[str, Dict[str, int]] = {
             "films": defaultdict(int),
@@ -72,6 +107,9 @@ class Recommender:
             # elif "besten Ratgeber" in source:
             #    source = "Ratgeber"
 
+            # Internierte Quellen beschleunigen die Dict-Zugriffe im Round-Robin
+            source = sys.intern(source)
+
             items_by_source[source].append(item)
 
         logger.debug(f"Items gruppiert: {len(items_by_source)} Quellen gefunden")
@@ -81,16 +119,31 @@ class Recommender:
         return items_by_source
 
     def _pick_balanced_items(
-        self, items: List[Dict[str, Any]], category: str, n: int = 12, items_per_source: int = 4
+        self,
+        items: List[Dict[str, Any]],
+        category: str,
+        n: int = 12,
+        items_per_source: int = 4,
+        shuffle: bool = False,
+        candidate_oversample: int = CANDIDATE_OVERSAMPLE,
     ) -> List[Dict[str, Any]]:
         """
         Wählt Items aus, wobei aus jeder Quelle gleichmäßig gewählt wird.
 
+        Jede Quelle hat ein eigenes Budget von items_per_source * candidate_oversample
+        Bibliotheksanfragen. Eine Quelle mit vielen nicht verfügbaren Titeln kann
+        so die übrigen Quellen nicht verdrängen; nicht verbrauchtes Budget von
+        Quellen, die die Rotation verlassen, steht den verbleibenden Quellen zur Verfügung.
+
         Args:
             items: Liste aller verfügbaren Items
             category: Kategorie ('films', 'albums', 'books')
             n: Gesamtanzahl gewünschter Items
             items_per_source: Items pro Quelle (default: 4)
+            shuffle: Items jeder Quelle in zufälliger statt in der gegebenen
+                Reihenfolge prüfen (default: False)
+            candidate_oversample: Bibliotheksanfragen pro gewünschtem Item
+                einer Quelle (default: CANDIDATE_OVERSAMPLE)
 
         Returns:
             Liste der ausgewählten Items, balanciert nach Quelle
@@ -104,66 +157,95 @@ class Recommender:
             logger.warning(f"Keine Items für '{category}' gefunden")
             return []
 
+        if shuffle:
+            # Einmal pro Quelle mischen, die Balance zwischen Quellen bleibt erhalten
+            for source, source_items in items_by_source.items():
+                items_by_source[source] = random.sample(source_items, k=len(source_items))
+
+        # Schlüssel und Suchanfrage einmalig vorberechnen, als (item, key, query)
+        # neben den Items, damit die Dictionaries des Aufrufers unverändert bleiben
+        lookups_by_source: Dict[str, List[Tuple[Dict[str, Any], Tuple[str, str], str]]] = {
+            source: [(item, *Recommender._lookup_for(item)) for item in source_items]
+            for source, source_items in items_by_source.items()
+        }
+
         selected_items: List[Dict[str, Any]] = []
-        sources = list(items_by_source.keys())
+        # Rotation: vorderste Quelle ist immer die aktuelle
+        sources = deque(items_by_source.keys())
 
         # Reset Source Counts für neue Empfehlungsrunde
         current_counts: Dict[str, int] = defaultdict(int)
 
         # Durchlaufe Quellen round-robin bis genug Items gefunden
-        source_index = 0
         max_iterations = n * len(sources) * 2  # Sicherheit gegen Endlosschleife
         iterations = 0
 
-        while len(selected_items) < n and iterations < max_iterations:
+        # Budget an Bibliotheksanfragen pro Quelle, dazu der Rest von
+        # Quellen, die die Rotation bereits verlassen haben
+        source_budgets: Dict[str, int] = {source: items_per_source * candidate_oversample for source in sources}
+        spare_budget = 0
+
+        # Gesättigte und erschöpfte Quellen verlassen die Rotation,
+        # daher endet die Schleife sobald keine aktive Quelle mehr übrig ist
+        while sources and len(selected_items) < n and iterations < max_iterations:
             iterations += 1
 
             # Wähle nächste Quelle
-            current_source = sources[source_index % len(sources)]
-            source_items = items_by_source[current_source]
+            current_source = sources[0]
+            source_lookups = lookups_by_source[current_source]
 
             # Prüfe ob diese Quelle schon genug Items beigetragen hat
             if current_counts[current_source] >= items_per_source:
-                source_index += 1
+                spare_budget += source_budgets.pop(current_source)
+                sources.popleft()
                 continue
 
-            # Durchsuche Items dieser Quelle
-            found_item = False
-            for item in source_items:
-                # Überspringe bereits vorgeschlagene oder geblacklistete Items
-                if self.state.is_already_suggested(category, item):
-                    continue
-                if self.blacklist.is_blacklisted(category, item):
-                    continue
-
-                # Prüfe Verfügbarkeit in Bibliothek
-                available_item = self._check_availability(item, category)
-
-                if available_item:
-                    selected_items.append(available_item)
-                    current_counts[current_source] += 1
-                    self.state.mark_suggested(category, item)
-
-                    logger.info(
-                        f"✅ '{item['title']}' von Quelle '{current_source}' "
-                        f"(Count: {current_counts[current_source]}/{items_per_source})"
-                    )
+            lookup_budget = source_budgets[current_source] + spare_budget
+            if lookup_budget <= 0:
+                logger.warning(f"Budget an Bibliotheksanfragen für Quelle '{current_source}' aufgebraucht")
+                source_budgets.pop(current_source)
+                sources.popleft()
+                continue
 
-                    found_item = True
-                    break
+            # Überspringe bereits vorgeschlagene oder geblacklistete Items
+            # in einem Durchlauf, bevor Bibliotheksanfragen gestellt werden
+            candidates = [lookup for lookup in source_lookups if self._is_candidate(category, lookup[0])]
+            candidates = candidates[:lookup_budget]
+
+            # Durchsuche Items dieser Quelle; pro Durchgang wird höchstens ein
+            # Item gebraucht, vorausgesucht wird daher erst nach Fehltreffern
+            found = self._find_first_available(candidates, category)
+
+            if found:
+                item, available_item = found
+                used = next(i for i, (candidate, _, _) in enumerate(candidates, 1) if candidate is item)
+                spare_budget -= self._charge_budget(source_budgets, current_source, used)
+                selected_items.append(available_item)
+                current_counts[current_source] += 1
+                self.state.mark_suggested(category, item)
+
+                logger.info(
+                    f"✅ '{item['title']}' von Quelle '{current_source}' "
+                    f"(Count: {current_counts[current_source]}/{items_per_source})"
+                )
 
-            # Wenn kein Item gefunden, markiere Quelle als erschöpft
-            if not found_item:
-                # Entferne erschöpfte Quelle
-                if current_source in sources:
-                    logger.debug(f"Quelle '{current_source}' erschöpft, entferne aus Rotation")
-                    sources.remove(current_source)
+                if current_counts[current_source] >= items_per_source:
+                    logger.debug(f"Quelle '{current_source}' gesättigt, entferne aus Rotation")
+                    spare_budget += source_budgets.pop(current_source)
+                    sources.popleft()
+                else:
+                    sources.rotate(-1)
+                continue
 
-                    if not sources:
-                        logger.warning("Alle Quellen erschöpft")
-                        break
+            # Kein Item gefunden: erschöpfte Quelle steht vorne, entferne sie
+            spare_budget -= self._charge_budget(source_budgets, current_source, len(candidates))
+            spare_budget += source_budgets.pop(current_source)
+            logger.debug(f"Quelle '{current_source}' erschöpft, entferne aus Rotation")
+            sources.popleft()
 
-            source_index += 1
+            if not sources:
+                logger.warning("Alle Quellen erschöpft")
+                break
 
         # Logging der finalen Verteilung
         logger.info(f"Balancierte Auswahl abgeschlossen: {len(selected_items)}/{n} Items")
@@ -172,6 +254,188 @@ class Recommender:
 
         return selected_items
 
+    @staticmethod
+    def _charge_budget(source_budgets: Dict[str, int], source: str, used: int) -> int:
+        """
+        Bucht verbrauchte Anfragen zuerst auf das Budget der Quelle.
+
+        Args:
+            source_budgets: Verbleibendes Budget pro Quelle (wird angepasst)
+            source: Quelle, deren Anfragen verbucht werden
+            used: Anzahl gestellter Bibliotheksanfragen
+
+        Returns:
+            Anteil, der über das Budget der Quelle hinausgeht und vom
+            gemeinsamen Restbudget abgezogen werden muss
+        """
+        from_source = min(used, source_budgets[source])
+        source_budgets[source] -= from_source
+        return used - from_source
+
+    def _find_first_available(
+        self, candidates: List[Tuple[Dict[str, Any], Tuple[str, str], str]], category: str, window: int = SEARCH_WORKERS
+    ) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Sucht das erste verfügbare Item in der Reihenfolge der Kandidaten.
+
+        Zunächst wird nur der erste Kandidat gesucht. Erst nach Fehltreffern
+        laufen die Anfragen für die nächsten Kandidaten im Thread-Pool voraus,
+        die Vorausschau verdoppelt sich dabei bis höchstens window. Ist der erste
+        Kandidat verfügbar, wird so keine überflüssige Anfrage an den Katalog
+        gestellt. Ausgewertet wird strikt in der ursprünglichen Reihenfolge,
+        nach einem Treffer werden die restlichen Anfragen abgebrochen.
+
+        Args:
+            candidates: (item, key, query) einer Quelle, die noch geprüft werden sollen
+            category: Kategorie ('films', 'albums', 'books')
+            window: Maximale Zahl gleichzeitig laufender Anfragen nach
+                Fehltreffern (default: SEARCH_WORKERS)
+
+        Returns:
+            Tuple aus (Original-Item, Item mit Verfügbarkeitsinfo) oder None
+        """
+        pending: deque = deque()
+        remaining = iter(candidates)
+        width = 1
+
+        def fill_window() -> None:
+            while len(pending) < width:
+                lookup = next(remaining, None)
+                if lookup is None:
+                    return
+                item, key, query = lookup
+                pending.append((item, self._pool.submit(self._search_item, item, key, query)))
+
+        fill_window()
+
+        try:
+            while pending:
+                item, future = pending.popleft()
+
+                hits: Optional[List[Dict[str, Any]]] = future.result()
+                if hits is not None:
+                    available_item = self._evaluate_hits(item, category, hits)
+                    if available_item:
+                        return item, available_item
+
+                # Fehltreffer: weitere Kandidaten vorab suchen
+                width = min(width * 2, window)
+                fill_window()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+        return None
+
+    def close(self) -> None:
+        """
+        Beendet den Thread-Pool für Bibliotheksanfragen.
+
+        Die übergebene library_search gehört dem Aufrufer und bleibt offen.
+        """
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> "Recommender":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _is_candidate(self, category: str, item: Dict[str, Any]) -> bool:
+        """
+        Prüft ob ein Item für eine Bibliotheksanfrage in Frage kommt.
+
+        Args:
+            category: Kategorie ('films', 'albums', 'books')
+            item: Medium-Dictionary mit title, author, type
+
+        Returns:
+            True wenn das Item weder vorgeschlagen noch geblacklistet ist
+        """
+        if self.state.is_already_suggested(category, item):
+            return False
+        return not self.blacklist.is_blacklisted(category, item)
+
+    def _search_item(
+        self, item: Dict[str, Any], key: Optional[Tuple[str, str]] = None, query: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Sucht ein Medium im Bibliothekskatalog.
+
+        Enthält nur den Netzwerkteil der Verfügbarkeitsprüfung und verändert
+        keinen Zustand, kann also auch parallel aufgerufen werden.
+
+        Args:
+            item: Medium-Dictionary mit title, author, type
+            key: Vorberechnetes (Titel, Autor) für die Entleih-Blacklist (optional)
+            query: Vorberechnete Suchanfrage (optional)
+
+        Returns:
+            Liste der Treffer oder None falls das Medium entliehen ist
+        """
+        # Vorberechnete Werte aus _pick_balanced_items, sonst neu bilden
+        if key is None or query is None:
+            key, query = Recommender._lookup_for(item)
+
+        # Prüfe zuerst Entleih-Blacklist
+        if get_borrowed_blacklist().is_blacklisted(*key):
+            logger.debug(f"'{item['title']}' ist entliehen - überspringe Suche")
+            return None
+
+        return self._cached_search(query)
+
+    def _cached_search(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Führt eine Katalogsuche aus, mit Zwischenspeicher pro Anfrage.
+
+        Treffer werden SEARCH_CACHE_TTL_SECONDS lang wiederverwendet, sodass
+        wiederholte Anfragen keinen erneuten HTTP-Aufruf auslösen. Leere
+        Ergebnisse werden nicht gespeichert, da sie auch von Netzwerkfehlern
+        stammen können.
+
+        Args:
+            query: Suchanfrage
+
+        Returns:
+            Liste der Treffer
+        """
+        key = query.lower()
+        now = time.monotonic()
+
+        with self._search_cache_lock:
+            cached = self._search_cache.get(key)
+            if cached is not None and now - cached[0] < SEARCH_CACHE_TTL_SECONDS:
+                logger.debug(f"Suchergebnis aus Zwischenspeicher: '{query}'")
+                return cached[1]
+
+        logger.debug(f"Suche nach: '{query}'")
+        hits: List[Dict[str, Any]] = self.library_search.search(query)
+
+        if hits:
+            with self._search_cache_lock:
+                if len(self._search_cache) >= SEARCH_CACHE_MAX_SIZE:
+                    self._evict_search_cache(now)
+                self._search_cache[key] = (now, hits)
+
+        return hits
+
+    def _evict_search_cache(self, now: float) -> None:
+        """
+        Entfernt abgelaufene Einträge und notfalls den ältesten Eintrag.
+
+        Muss mit gehaltenem _search_cache_lock aufgerufen werden.
+
+        Args:
+            now: Aktueller Zeitpunkt (time.monotonic)
+        """
+        expired = [key for key, (stored_at, _) in self._search_cache.items() if now - stored_at >= SEARCH_CACHE_TTL_SECONDS]
+        for key in expired:
+            del self._search_cache[key]
+
+        if len(self._search_cache) >= SEARCH_CACHE_MAX_SIZE:
+            # Dicts behalten die Einfügereihenfolge, der erste Key ist der älteste
+            del self._search_cache[next(iter(self._search_cache))]
+
     def _check_availability(self, item: Dict[str, Any], category: str) -> Optional[Dict[str, Any]]:
         """
         Prüft ob ein Medium in der Bibliothek verfügbar ist.
@@ -188,23 +452,29 @@ class Recommender:
         Returns:
             Item-Dictionary mit Verfügbarkeitsinfo oder None falls nicht verfügbar
         """
-        media_type: str = item.get("type", "")
-
-        # Prüfe zuerst Entleih-Blacklist
-        borrowed_blacklist = get_borrowed_blacklist()
-        if borrowed_blacklist.is_blacklisted(item.get("title", ""), item.get("author", "")):
-            logger.debug(f"'{item['title']}' ist entliehen - überspringe Suche")
+        hits = self._search_item(item)
+        if hits is None:
             return None
 
-        if media_type == "Buch":
-            query = f"{item.get('author', '')} {item.get('title')} {media_type}".strip()
-        else:
-            query = f"{item.get('title')} {item.get('author', '')} {media_type}".strip()
+        return self._evaluate_hits(item, category, hits)
 
-        logger.debug(f"Suche nach: '{query}'")
+    def _evaluate_hits(self, item: Dict[str, Any], category: str, hits: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Wertet die Katalogtreffer eines Mediums aus.
 
-        # Normale Suche
-        hits: List[Dict[str, Any]] = self.library_search.search(query)
+        Pflegt Blacklist und Entleih-Blacklist und ermittelt ob ein
+        passender Treffer verfügbar ist.
+
+        Args:
+            item: Medium-Dictionary mit title, author, type
+            category: Kategorie ('films', 'albums', 'books')
+            hits: Treffer aus dem Bibliothekskatalog
+
+        Returns:
+            Item-Dictionary mit Verfügbarkeitsinfo oder None falls nicht verfügbar
+        """
+        media_type: str = item.get("type", "")
+        borrowed_blacklist = get_borrowed_blacklist()
 
         # Keine Treffer → Blacklist
         if not hits or len(hits) == 0:
@@ -237,12 +507,8 @@ class Recommender:
             film_hits = []
 
             for hit in hits:
-                zentralbib_info = hit.get("zentralbibliothek_info", "")
-
-                # Prüfe auf "Uv" ohne Wortgrenzen
-                has_uv = bool(re.search(r"Uv", zentralbib_info))
-
-                if has_uv:
+                # Einfache Teilstring-Suche, ein Regex wird hierfür nicht benötigt
+                if _FILM_MARKER in hit.get("zentralbibliothek_info", ""):
                     film_hits.append(hit)
                     logger.debug(f"Film bestätigt: {hit.get('title', 'Unknown')}")
                 else:
@@ -257,16 +523,22 @@ class Recommender:
             # Verwende nur Film-Treffer
             hits = film_hits
 
-        # Prüfen auf verfügbar UND entliehen
-        available: List[Dict[str, Any]] = []
+        # Prüfen auf verfügbar UND entliehen; von den verfügbaren wird
+        # nur der erste Treffer benötigt
+        first_available: Optional[Dict[str, Any]] = None
         borrowed: List[Dict[str, Any]] = []
 
         for hit in hits:
-            zentralbib_info = hit.get("zentralbibliothek_info", "")
+            zentralbib_info = hit.get("zentralbibliothek_info")
+            if not zentralbib_info:
+                continue
 
-            if "verfügbar" in zentralbib_info.lower():
-                available.append(hit)
-            elif "entliehen" in zentralbib_info.lower():
+            info_folded = zentralbib_info.casefold()
+
+            if _AVAILABLE_MARKER in info_folded:
+                if first_available is None:
+                    first_available = hit
+            elif _BORROWED_MARKER in info_folded:
                 borrowed.append(hit)
 
         # NEU: Entliehene auf Entleih-Blacklist
@@ -285,27 +557,56 @@ class Recommender:
                     logger.debug(f"📅 Auf Entleih-Blacklist: {borrowed_item.get('title', '')}")
 
         # Prüfe verfügbare
-        if available:
-            # Alle Verfügbarkeits-Infos zusammenfassen
-            infos: List[str] = [h["zentralbibliothek_info"] for h in hits if "zentralbibliothek_info" in h]
-
-            # Kombiniere und kürze auf 300 Zeichen
-            combined_info = ", ".join(infos)
-            truncated_info = Recommender._truncate_text(combined_info, max_length=300)
-
-            # Kopiere das Item und füge bib_number hinzu
-            result_item: Dict[str, Any] = item.copy()
+        if first_available is not None:
+            # Kopiere das Item ohne interne Felder und füge bib_number hinzu
+            result_item: Dict[str, Any] = {k: v for k, v in item.items() if not k.startswith("_")}
             # WICHTIG: Verwende "zentralbibliothek_bestand" für die Anzeige, nicht "zentralbibliothek_info"!
-            bestand_info = available[0].get("zentralbibliothek_bestand", available[0].get("zentralbibliothek_info", ""))
+            bestand_info = first_available.get("zentralbibliothek_bestand", first_available.get("zentralbibliothek_info", ""))
             result_item["bib_number"] = Recommender._truncate_text(bestand_info, max_length=300)
 
-            logger.debug(f"Verfügbarkeit gekürzt: {len(combined_info)} -> " f"{len(truncated_info)} Zeichen")
+            # Zusammengefasste Infos werden nur für das Debug-Logging gebraucht
+            if logger.isEnabledFor(logging.DEBUG):
+                infos = [h["zentralbibliothek_info"] for h in hits if h.get("zentralbibliothek_info")]
+                truncated_info = Recommender._join_truncated(infos, max_length=300)
+                logger.debug(f"Verfügbarkeit gekürzt auf {len(truncated_info)} Zeichen")
 
             return result_item
 
         logger.debug(f"'{item['title']}' nicht verfügbar (alle entliehen)")
         return None
 
+    @staticmethod
+    def _lookup_for(item: Dict[str, Any]) -> Tuple[Tuple[str, str], str]:
+        """
+        Bildet Entleih-Schlüssel und Suchanfrage eines Mediums.
+
+        Args:
+            item: Medium-Dictionary mit title, author, type
+
+        Returns:
+            Tuple aus ((Titel, Autor), Suchanfrage)
+        """
+        return (item.get("title", ""), item.get("author", "")), Recommender._build_query(item)
+
+    @staticmethod
+    def _build_query(item: Dict[str, Any]) -> str:
+        """
+        Baut die Suchanfrage für den Bibliothekskatalog.
+
+        Die Reihenfolge der Felder hängt vom Medientyp ab (_QUERY_TEMPLATES),
+        bei Büchern steht der Autor vorne, sonst der Titel.
+
+        Args:
+            item: Medium-Dictionary mit title, author, type
+
+        Returns:
+            Suchanfrage als String
+        """
+        media_type: str = item.get("type", "")
+        template = _QUERY_TEMPLATES.get(media_type, _DEFAULT_QUERY_TEMPLATE)
+
+        return template.format(title=item.get("title", ""), author=item.get("author", ""), type=media_type).strip()
+
     @staticmethod
     def _truncate_text(text: str, max_length: int = 400) -> str:
         """
@@ -323,6 +624,102 @@ class Recommender:
 
         return text[: max_length - 3].strip() + "..."
 
+    @staticmethod
+    def _join_truncated(parts: List[str], separator: str = ", ", max_length: int = 400) -> str:
+        """
+        Verbindet Textteile und kürzt das Ergebnis auf maximale Länge.
+
+        Liefert dasselbe Ergebnis wie ``_truncate_text(separator.join(parts))``,
+        bricht das Zusammenfügen aber ab, sobald die maximale Länge
+        überschritten ist. Lange Trefferlisten werden so nicht vollständig
+        zu einem String zusammengebaut, nur um danach gekürzt zu werden.
+
+        Args:
+            parts: Zu verbindende Textteile
+            separator: Trennzeichen zwischen den Teilen (default: ", ")
+            max_length: Maximale Länge (default: 400)
+
+        Returns:
+            Verbundener Text mit "..." falls gekürzt
+        """
+        buffer: List[str] = []
+        total = 0
+
+        for part in parts:
+            if buffer:
+                buffer.append(separator)
+                total += len(separator)
+            buffer.append(part)
+            total += len(part)
+
+            if total > max_length:
+                break
+
+        return Recommender._truncate_text("".join(buffer), max_length=max_length)
+
+    def suggest(
+        self,
+        category: str,
+        items: List[Dict[str, Any]],
+        n: int = 12,
+        items_per_source: int = 4,
+        shuffle: bool = False,
+        candidate_oversample: int = CANDIDATE_OVERSAMPLE,
+    ) -> List[Dict[str, Any]]:
+        """
+        Wählt verfügbare Medien einer Kategorie aus, balanciert nach Quellen.
+
+        Args:
+            category: Kategorie ('films', 'albums', 'books')
+            items: Liste von Medien mit Titel, Autor, Typ und Quelle
+            n: Gesamtanzahl gewünschter Vorschläge (default: 12)
+            items_per_source: Items pro Quelle (default: 4)
+            shuffle: Medien jeder Quelle in zufälliger Reihenfolge prüfen,
+                damit verschiedene Läufe verschiedene Titel vorschlagen
+                (default: False, Reihenfolge der Quelle bleibt erhalten)
+            candidate_oversample: Bibliotheksanfragen pro gewünschtem Item
+                einer Quelle (default: CANDIDATE_OVERSAMPLE)
+
+        Returns:
+            Liste der vorgeschlagenen Medien, balanciert nach Quelle
+        """
+        return self._pick_balanced_items(
+            items, category, n, items_per_source, shuffle, candidate_oversample=candidate_oversample
+        )
+
+    def suggest_all(
+        self, groups: Dict[str, List[Dict[str, Any]]], n: int = 12, items_per_source: int = 4
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Erstellt Vorschläge für mehrere Kategorien parallel.
+
+        Jede Kategorie läuft in einem eigenen Thread, sodass sich die
+        Bibliotheksanfragen der Kategorien zeitlich überlappen.
+
+        Args:
+            groups: Dictionary mit Kategorie als Key und Medienliste als Value
+            n: Gesamtanzahl gewünschter Vorschläge pro Kategorie (default: 12)
+            items_per_source: Items pro Quelle (default: 4)
+
+        Returns:
+            Dictionary mit Kategorie als Key und Vorschlägen als Value
+
+        Example:
+            >>> recommender.suggest_all({"films": films, "albums": albums, "books": books})
+        """
+        if not groups:
+            return {}
+
+        logger.info(f"Erstelle Vorschläge parallel für {len(groups)} Kategorien")
+
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            futures = {
+                category: executor.submit(self.suggest, category, items, n, items_per_source)
+                for category, items in groups.items()
+            }
+
+        return {category: future.result() for category, future in futures.items()}
+
     def suggest_films(self, films: List[Dict[str, Any]], n: int = 12, items_per_source: int = 4) -> List[Dict[str, Any]]:
         """
         Wählt verfügbare Filme aus, balanciert nach Quellen.
@@ -339,7 +736,7 @@ class Recommender:
             Liste der vorgeschlagenen Filme, balanciert nach Quelle
         """
         logger.info(f"Erstelle {n} balancierte Filmvorschläge " f"({items_per_source} pro Quelle)")
-        return self._pick_balanced_items(films, "films", n, items_per_source)
+        return self.suggest("films", films, n, items_per_source)
 
     def suggest_albums(self, albums: List[Dict[str, Any]], n: int = 12, items_per_source: int = 4) -> List[Dict[str, Any]]:
         """
@@ -357,7 +754,7 @@ class Recommender:
             Liste der vorgeschlagenen Alben, balanciert nach Quelle
         """
         logger.info(f"Erstelle {n} balancierte Albumvorschläge " f"({items_per_source} pro Quelle)")
-        return self._pick_balanced_items(albums, "albums", n, items_per_source)
+        return self.suggest("albums", albums, n, items_per_source)
 
     def suggest_books(self, books: List[Dict[str, Any]], n: int = 12, items_per_source: int = 4) -> List[Dict[str, Any]]:
         """
@@ -375,4 +772,4 @@ class Recommender:
             Liste der vorgeschlagenen Bücher, balanciert nach Quelle
         """
         logger.info(f"Erstelle {n} balancierte Buchvorschläge " f"({items_per_source} pro Quelle)")
-        return self._pick_balanced_items(books, "books", n, items_per_source)
+        return self.suggest("books", books, n, items_per_source)
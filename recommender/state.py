@@ -5,12 +5,51 @@ Speichert nur explizit abgelehnte Medien persistent
 """
 
 import os
+import sys
 import json
+import atexit
+import functools
+import threading
+import weakref
 
-from utils.io import DATA_DIR
+from utils.io import DATA_DIR, load_json, save_json
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
 
 STATE_FILE = os.path.join(DATA_DIR, "state.json")
 
+# Verzögerung in Sekunden, nach der Ablehnungen gesammelt gespeichert werden
+SAVE_DELAY_SECONDS = 2.0
+
+# Zustände mit ungespeicherten Ablehnungen; schwache Referenzen, damit
+# nicht mehr benutzte Instanzen nicht bis zum Programmende am Leben bleiben
+_dirty_states = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_dirty_states():
+    """Speichert beim Programmende alle noch ungespeicherten Ablehnungen"""
+    for state in list(_dirty_states):
+        state.save()
+
+
+@functools.lru_cache(maxsize=4096)
+def _make_title_key(title):
+    """
+    Bildet den internierten Vergleichsschlüssel zu einem Titel.
+
+    casefold() statt lower(), damit z.B. "ß" und "ss" als gleich gelten.
+    Zwischengespeichert pro Titel, so bleiben die Items selbst unverändert
+    und landen ohne interne Felder in suggested und state.json.
+    """
+    return sys.intern(title.casefold())
+
+
+def _title_key(item):
+    """Liefert den Vergleichsschlüssel eines Items"""
+    return _make_title_key(item["title"])
+
 
 class AppState:
     """
@@ -30,52 +69,109 @@ class AppState:
         # Wird bei jedem App-Start zurückgesetzt
         self.suggested = {"films": [], "albums": [], "books": []}
 
+        # Set-Indizes der Titel-Schlüssel (_title_key) für O(1)-Abfragen,
+        # werden parallel zu den Listen gepflegt
+        self._suggested_idx = {category: set() for category in self.suggested}
+        # Der Index der Ablehnungen wird erst bei der ersten Abfrage einer
+        # Kategorie aufgebaut (_rejected_index), ungenutzte Kategorien kosten nichts
+        self._rejected_idx = {}
+
+        # Ungespeicherte Ablehnungen werden verzögert und spätestens
+        # beim Beenden des Programms gesammelt geschrieben (_flush_dirty_states)
+        self._dirty = False
+        self._save_timer = None
+        self._save_lock = threading.Lock()
+
     @staticmethod
     def load_rejected_state():
         """Lädt nur die abgelehnten Medien aus der JSON-Datei"""
         if os.path.exists(STATE_FILE):
             try:
-                with open(STATE_FILE, "r", encoding="utf-8") as f:
-                    rejected = json.load(f)
-                print(f"DEBUG: {sum(len(items) for items in rejected.values())} abgelehnte Medien aus state.json geladen.")
+                rejected = load_json(STATE_FILE)
+                logger.info("%d abgelehnte Medien aus state.json geladen", sum(len(items) for items in rejected.values()))
                 return rejected
             except (json.JSONDecodeError, KeyError) as e:
-                print(f"DEBUG: Fehler beim Laden der state.json: {e}")
-                print("DEBUG: Erstelle neue state.json")
+                logger.warning("Fehler beim Laden der state.json: %s - erstelle neue state.json", e)
                 return {"films": [], "albums": [], "books": []}
         else:
             rejected = {"films": [], "albums": [], "books": []}
             AppState.save_rejected_state(rejected)
-            print("DEBUG: Neue state.json erstellt.")
+            logger.info("Neue state.json erstellt")
             return rejected
 
     @staticmethod
     def save_rejected_state(rejected):
         """Speichert nur die abgelehnten Medien in die JSON-Datei"""
         try:
-            with open(STATE_FILE, "w", encoding="utf-8") as f:
-                json.dump(rejected, f, ensure_ascii=False, indent=2)
-            print(f"DEBUG: {sum(len(items) for items in rejected.values())} abgelehnte Medien in state.json gespeichert.")
+            save_json(STATE_FILE, rejected)
+            logger.debug("%d abgelehnte Medien in state.json gespeichert", sum(len(items) for items in rejected.values()))
         except Exception as e:
-            print(f"DEBUG: Fehler beim Speichern der state.json: {e}")
+            logger.error("Fehler beim Speichern der state.json: %s", e)
+
+    def save(self):
+        """
+        Speichert ungespeicherte Ablehnungen sofort.
+
+        Wird automatisch verzögert nach reject() und beim Programmende
+        aufgerufen, kann aber auch direkt genutzt werden.
+        """
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+
+            if not self._dirty:
+                return
+
+            self._dirty = False
+            _dirty_states.discard(self)
+            self.save_rejected_state(self.rejected)
+
+    def close(self):
+        """
+        Speichert ausstehende Ablehnungen sofort und bricht den Speicher-Timer ab.
+
+        Sollte aufgerufen werden, bevor der Zustand verworfen wird, damit kein
+        verzögertes Speichern später in eine inzwischen geänderte STATE_FILE schreibt.
+        """
+        self.save()
+
+    def _schedule_save(self):
+        """Markiert den Zustand als geändert und plant das Speichern ein"""
+        with self._save_lock:
+            self._dirty = True
+            _dirty_states.add(self)
+
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(SAVE_DELAY_SECONDS, self.save)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def _rejected_index(self, category):
+        """Liefert den Titel-Index der Ablehnungen einer Kategorie, baut ihn bei Bedarf auf"""
+        index = self._rejected_idx.get(category)
+        if index is None:
+            index = {_make_title_key(x["title"]) for x in self.rejected.get(category, [])}
+            self._rejected_idx[category] = index
+        return index
 
     def is_already_suggested(self, category, item):
         """
         Prüft, ob ein Item schon vorgeschlagen wurde (im aktuellen Lauf)
         oder explizit abgelehnt wurde (persistent)
         """
-        title_lower = item["title"].lower()
+        title_key = _title_key(item)
 
         # Prüfe ob schon in diesem Lauf vorgeschlagen
-        already_suggested_this_run = any(x["title"].lower() == title_lower for x in self.suggested.get(category, []))
+        already_suggested_this_run = title_key in self._suggested_idx.get(category, ())
 
         # Prüfe ob explizit abgelehnt (persistent)
-        already_rejected = any(x["title"].lower() == title_lower for x in self.rejected.get(category, []))
+        already_rejected = title_key in self._rejected_index(category)
 
         if already_suggested_this_run:
-            print(f"DEBUG: '{item['title']}' bereits in diesem Lauf vorgeschlagen")
+            logger.debug("'%s' bereits in diesem Lauf vorgeschlagen", item["title"])
         if already_rejected:
-            print(f"DEBUG: '{item['title']}' wurde früher abgelehnt")
+            logger.debug("'%s' wurde früher abgelehnt", item["title"])
 
         return already_suggested_this_run or already_rejected
 
@@ -83,12 +179,14 @@ class AppState:
         """Markiert ein Item als vorgeschlagen (nur im Arbeitsspeicher)"""
         if category not in self.suggested:
             self.suggested[category] = []
+        index = self._suggested_idx.setdefault(category, set())
 
         # Prüfe ob schon vorhanden
-        title_lower = item["title"].lower()
-        if not any(x["title"].lower() == title_lower for x in self.suggested[category]):
+        title_key = _title_key(item)
+        if title_key not in index:
             self.suggested[category].append(item)
-            print(f"DEBUG: '{item['title']}' als vorgeschlagen markiert")
+            index.add(title_key)
+            logger.debug("'%s' als vorgeschlagen markiert", item["title"])
 
     def reject(self, category, item):
         """
@@ -96,29 +194,35 @@ class AppState:
         """
         if category not in self.rejected:
             self.rejected[category] = []
+        index = self._rejected_index(category)
 
-        title_lower = item["title"].lower()
+        title_key = _title_key(item)
 
         # Prüfe ob schon in abgelehnten Items
-        if not any(x["title"].lower() == title_lower for x in self.rejected[category]):
-            self.rejected[category].append(item)
-            print(f"DEBUG: '{item['title']}' als abgelehnt markiert")
+        if title_key not in index:
+            # Ohne interne Felder speichern, state.json enthält nur Nutzdaten
+            self.rejected[category].append({k: v for k, v in item.items() if not k.startswith("_")})
+            index.add(title_key)
+            logger.info("'%s' als abgelehnt markiert", item["title"])
 
-            # Speichere sofort persistent
-            self.save_rejected_state(self.rejected)
+            # Speichere verzögert, mehrere Ablehnungen werden zusammengefasst
+            self._schedule_save()
         else:
-            print(f"DEBUG: '{item['title']}' war bereits als abgelehnt markiert")
+            logger.debug("'%s' war bereits als abgelehnt markiert", item["title"])
 
     def reset_rejected(self):
         """Setzt alle abgelehnten Medien zurück (löscht state.json)"""
         self.rejected = {"films": [], "albums": [], "books": []}
-        self.save_rejected_state(self.rejected)
-        print("DEBUG: Alle abgelehnten Medien zurückgesetzt")
+        self._rejected_idx = {}
+        self._dirty = True
+        self.save()
+        logger.info("Alle abgelehnten Medien zurückgesetzt")
 
     def reset_suggested(self):
         """Setzt nur die aktuell vorgeschlagenen zurück"""
         self.suggested = {"films": [], "albums": [], "books": []}
-        print("DEBUG: Aktuell vorgeschlagene Medien zurückgesetzt")
+        self._suggested_idx = {category: set() for category in self.suggested}
+        logger.info("Aktuell vorgeschlagene Medien zurückgesetzt")
 
     def get_stats(self):
         """Gibt Statistiken über den aktuellen Zustand zurück"""
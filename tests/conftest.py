@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Gemeinsame Fixtures für alle Tests
+"""
+
+import importlib
+import shutil
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock
+from recommender import recommender as recommender_module
+from recommender import state as state_module
+from recommender.recommender import Recommender
+from recommender.state import AppState
+
+# Module, die von fast allen Tests benötigt werden
+_WARM_MODULES = (
+    "utils.blacklist",
+    "utils.artist_blacklist",
+    "recommender.recommender",
+    "recommender.state",
+    "library.parsers",
+    "library.search",
+    "preprocessing.filters",
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_imports():
+    """Importiert die Kernmodule einmal pro (xdist-)Worker vor dem ersten Test"""
+    for module_name in _WARM_MODULES:
+        importlib.import_module(module_name)
+
+
+# (Quelle, Präfix) der Sample-Filme
+_FILM_SOURCES = (
+    ("BBC 100 Greatest Films of the 21st Century", "BBC"),
+    ("FBW Prädikat besonders wertvoll", "FBW"),
+    ("Oscar (Bester Film)", "Oscar"),
+)
+
+# (Quelle, Titel-Präfix, Interpret-Präfix) der Sample-Alben; {n} ist die laufende Nummer
+_ALBUM_SOURCES = (
+    ("Radio Eins Top 100 Alben 2019", "Radio Album", "Radio Artist"),
+    ("Oscar (Beste Filmmusik)", "Oscar Soundtrack", "Composer"),
+    ("Interessant für dich (Top-Interpret: Artist {n})", "Personal Album", "Top Artist"),
+)
+
+
+@pytest.fixture(scope="session")
+def _sample_films():
+    """Sample-Filme aus drei Quellen (alle mit UV), einmal pro Testlauf erstellt"""
+    return tuple(
+        {"title": f"{prefix} Film {n}", "author": f"{prefix} Director {n}", "type": "DVD", "source": source}
+        for source, prefix in _FILM_SOURCES
+        for n in range(1, 11)
+    )
+
+
+@pytest.fixture(scope="session")
+def _sample_albums():
+    """Sample-Alben aus drei Quellen, einmal pro Testlauf erstellt"""
+    return tuple(
+        {"title": f"{title} {n}", "author": f"{author} {n}", "type": "CD", "source": source.format(n=n)}
+        for source, title, author in _ALBUM_SOURCES
+        for n in range(1, 11)
+    )
+
+
+@pytest.fixture
+def sample_films(_sample_films):
+    """
+    Flache Kopie der Sample-Filme.
+
+    Jeder Test bekommt eigene Dictionaries, damit Änderungen an den Items
+    nicht in andere Tests durchschlagen.
+    """
+    return [dict(film) for film in _sample_films]
+
+
+@pytest.fixture
+def sample_albums(_sample_albums):
+    """Flache Kopie der Sample-Alben (siehe sample_films)"""
+    return [dict(album) for album in _sample_albums]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _state_file(tmp_path_factory):
+    """Leitet STATE_FILE für den gesamten Testlauf in ein tmp-Verzeichnis um"""
+    state_file = str(tmp_path_factory.mktemp("state") / "state.json")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(state_module, "STATE_FILE", state_file)
+        yield state_file
+
+
+@pytest.fixture(scope="session")
+def _canonical_state(tmp_path_factory):
+    """Leere state.json, einmal pro Testlauf geschrieben"""
+    path = tmp_path_factory.mktemp("canonical_state") / "state.json"
+    path.write_bytes(b'{"films": [], "albums": [], "books": []}')
+    return path
+
+
+@pytest.fixture
+def temp_state_file(_canonical_state, tmp_path, monkeypatch):
+    """Kopie der leeren state.json pro Test, STATE_FILE zeigt darauf"""
+    temp_path = tmp_path / "state.json"
+    shutil.copyfile(_canonical_state, temp_path)
+    monkeypatch.setattr(state_module, "STATE_FILE", str(temp_path))
+    return str(temp_path)
+
+
+@pytest.fixture(scope="session")
+def _app_state(_state_file):
+    """Einmal pro Testlauf erstellter AppState, wird pro Test zurückgesetzt"""
+    state = AppState()
+    yield state
+    state.close()
+
+
+@pytest.fixture
+def mock_state(_app_state):
+    """Geleerter AppState, schreibt in die state.json des Testlaufs"""
+    _app_state.reset_suggested()
+    _app_state.reset_rejected()
+    return _app_state
+
+
+@pytest.fixture(scope="session")
+def _blacklist_stub():
+    """Stub für Blacklist; nur add_to_blacklist zeichnet Aufrufe auf"""
+    return SimpleNamespace(is_blacklisted=lambda *args, **kwargs: False, add_to_blacklist=Mock())
+
+
+@pytest.fixture(scope="session")
+def _borrowed_blacklist_stub():
+    """Stub für BorrowedBlacklist; nur add_to_blacklist zeichnet Aufrufe auf"""
+    return SimpleNamespace(is_blacklisted=lambda *args, **kwargs: False, add_to_blacklist=Mock())
+
+
+@pytest.fixture
+def mock_blacklist(_blacklist_stub):
+    """Geteilter Blacklist-Stub mit zurückgesetzten Aufrufzählern"""
+    _blacklist_stub.add_to_blacklist.reset_mock()
+    return _blacklist_stub
+
+
+@pytest.fixture
+def mock_borrowed_blacklist(_borrowed_blacklist_stub):
+    """Geteilter BorrowedBlacklist-Stub mit zurückgesetzten Aufrufzählern"""
+    _borrowed_blacklist_stub.add_to_blacklist.reset_mock()
+    return _borrowed_blacklist_stub
+
+
+@pytest.fixture
+def recommender_factory(monkeypatch, mock_blacklist, mock_borrowed_blacklist):
+    """
+    Erstellt Recommender mit gemockten Blacklists.
+
+    Die Blacklist-Singletons werden per monkeypatch ersetzt, die
+    Thread-Pools aller erstellten Recommender nach dem Test geschlossen.
+    """
+    created = []
+
+    def factory(library_search, state, blacklist=None):
+        blacklist = mock_blacklist if blacklist is None else blacklist
+        monkeypatch.setattr(recommender_module, "get_blacklist", lambda: blacklist)
+        monkeypatch.setattr(recommender_module, "get_borrowed_blacklist", lambda: mock_borrowed_blacklist)
+
+        recommender = Recommender(library_search, state)
+        created.append(recommender)
+        return recommender
+
+    yield factory
+
+    for recommender in created:
+        recommender.close()
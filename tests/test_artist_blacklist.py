@@ -4,41 +4,29 @@ Unit Tests für das Artist-Blacklist System
 """
 
 import pytest
-import os
-import json
-import tempfile
+import time
 from datetime import datetime, timedelta
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 from collections import Counter
 from utils.artist_blacklist import (
     ArtistBlacklist,
     get_filtered_top_artists,
     update_artist_blacklist_from_search_results,
     get_artist_blacklist,
+    SECONDS_PER_DAY,
 )
 
 
-class TestArtistBlacklist:
-    """Tests für die ArtistBlacklist-Klasse."""
-
-    @pytest.fixture
-    def temp_blacklist_file(self):
-        """Erstellt temporäre Blacklist-Datei für Tests."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump({}, f)
-            temp_path = f.name
+@pytest.fixture
+def artist_blacklist(monkeypatch):
+    """Erstellt ArtistBlacklist-Instanz, die nur im Speicher arbeitet."""
+    monkeypatch.setattr(ArtistBlacklist, "_load_blacklist", lambda self: {})
+    monkeypatch.setattr(ArtistBlacklist, "_save_blacklist", lambda self: None)
+    return ArtistBlacklist()
 
-        yield temp_path
 
-        # Cleanup
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-
-    @pytest.fixture
-    def artist_blacklist(self, temp_blacklist_file):
-        """Erstellt ArtistBlacklist-Instanz mit temporärer Datei."""
-        with patch("utils.artist_blacklist.ARTIST_BLACKLIST_FILE", temp_blacklist_file):
-            return ArtistBlacklist()
+class TestArtistBlacklist:
+    """Tests für die ArtistBlacklist-Klasse."""
 
     def test_init_empty_blacklist(self, artist_blacklist):
         """Test: Initialisierung mit leerer Blacklist."""
@@ -102,6 +90,34 @@ class TestArtistBlacklist:
         # Sollte True zurückgeben (noch nicht Re-Check fällig)
         assert artist_blacklist.is_blacklisted("Queen") is True
 
+    def test_is_blacklisted_with_given_time(self, artist_blacklist):
+        """Test: Übergebene Uhrzeit bestimmt, ob der Re-Check fällig ist."""
+        artist_blacklist.add_to_blacklist("Queen", 42)
+        checked_ts = artist_blacklist.blacklist["queen"]["last_checked_ts"]
+
+        assert artist_blacklist.is_blacklisted("Queen", now_ts=checked_ts + 364 * SECONDS_PER_DAY) is True
+        assert artist_blacklist.is_blacklisted("Queen", now_ts=checked_ts + 365 * SECONDS_PER_DAY) is False
+
+    def test_legacy_entry_gets_timestamp(self, artist_blacklist):
+        """Test: Einträge nur mit ISO-Datum erhalten einen Zeitstempel."""
+        recent = datetime.now() - timedelta(days=10)
+        artist_blacklist.blacklist["legacy"] = {"artist_name": "Legacy", "last_checked": recent.isoformat()}
+
+        assert artist_blacklist.is_blacklisted("Legacy") is True
+        assert artist_blacklist.blacklist["legacy"]["last_checked_ts"] == int(recent.timestamp())
+
+    def test_legacy_added_at_gets_timestamp(self, artist_blacklist):
+        """Test: added_at wird für Statistik und Aufräumen nur einmal geparst."""
+        recent = datetime.now() - timedelta(days=10)
+        old = datetime.now() - timedelta(days=800)
+        artist_blacklist.blacklist["recent"] = {"artist_name": "Recent", "added_at": recent.isoformat()}
+        artist_blacklist.blacklist["old"] = {"artist_name": "Old", "added_at": old.isoformat()}
+
+        assert artist_blacklist.get_stats()["recent_additions"] == 1
+        assert artist_blacklist.blacklist["recent"]["added_at_ts"] == int(recent.timestamp())
+        assert artist_blacklist.clear_old_entries(days=730) == 1
+        assert list(artist_blacklist.blacklist) == ["recent"]
+
     def test_remove_from_blacklist(self, artist_blacklist):
         """Test: Künstler von Blacklist entfernen."""
         artist_blacklist.add_to_blacklist("U2", 28)
@@ -120,6 +136,53 @@ class TestArtistBlacklist:
 
         assert removed is False
 
+    def test_filter_names(self, artist_blacklist):
+        """Test: filter_names entfernt aktive Einträge, berücksichtigt aber Re-Checks."""
+        artist_blacklist.add_to_blacklist("Pink Floyd", 38)
+
+        old_date = (datetime.now() - timedelta(days=400)).isoformat()
+        artist_blacklist.blacklist["beatles"] = {
+            "artist_name": "Beatles",
+            "song_count": 50,
+            "reason": "Test",
+            "added_at": old_date,
+            "last_checked": old_date,
+            "check_count": 1,
+        }
+
+        survivors = artist_blacklist.filter_names(["PINK FLOYD", "pink floyd", "Beatles", "Queen"])
+
+        assert survivors == {"Beatles", "Queen"}
+
+    def test_batch_saves_once(self, artist_blacklist, monkeypatch):
+        """Test: Änderungen innerhalb von batch() werden einmal gespeichert."""
+        mock_save = MagicMock()
+        monkeypatch.setattr(artist_blacklist, "_save_blacklist", mock_save)
+
+        with artist_blacklist.batch():
+            artist_blacklist.add_to_blacklist("Artist A", 10)
+            artist_blacklist.add_to_blacklist("Artist B", 20)
+            artist_blacklist.remove_from_blacklist("Artist A")
+            mock_save.assert_not_called()
+
+        mock_save.assert_called_once()
+        artist_blacklist.add_to_blacklist("Artist C", 30)
+
+        assert mock_save.call_count == 2
+        assert set(artist_blacklist.blacklist) == {"artist b", "artist c"}
+
+    def test_bulk_add(self, artist_blacklist, monkeypatch):
+        """Test: bulk_add speichert einmal mit gemeinsamem Zeitstempel."""
+        mock_save = MagicMock()
+        monkeypatch.setattr(artist_blacklist, "_save_blacklist", mock_save)
+
+        artist_blacklist.bulk_add([("Artist A", 10, "Test"), ("Artist B", 20, "Test")])
+
+        mock_save.assert_called_once()
+        entries = artist_blacklist.blacklist
+        assert entries["artist a"]["last_checked"] == entries["artist b"]["last_checked"]
+        assert artist_blacklist.is_blacklisted("Artist B") is True
+
     def test_get_artists_due_for_recheck(self, artist_blacklist):
         """Test: Ermittlung von Künstlern fällig für Re-Check."""
         # Füge alte und neue Einträge hinzu
@@ -200,8 +263,6 @@ class TestArtistBlacklist:
         original_date = artist_blacklist.blacklist["duplicate artist"]["last_checked"]
 
         # Warte kurz
-        import time
-
         time.sleep(0.1)
 
         # Füge erneut hinzu
@@ -214,6 +275,20 @@ class TestArtistBlacklist:
         assert check_count == 2
 
 
+class TestPersistence:
+    """Tests für das Speichern und Laden der Blacklist-Datei."""
+
+    def test_save_and_load_roundtrip(self, tmp_path, monkeypatch):
+        """Test: Einträge überstehen Speichern und erneutes Laden."""
+        monkeypatch.setattr("utils.artist_blacklist.ARTIST_BLACKLIST_FILE", str(tmp_path / "blacklist_artists.json"))
+
+        ArtistBlacklist().add_to_blacklist("Radiohead", 42, "Keine neuen CDs gefunden")
+        reloaded = ArtistBlacklist()
+
+        assert reloaded.is_blacklisted("Radiohead") is True
+        assert reloaded.blacklist["radiohead"]["song_count"] == 42
+
+
 class TestFilteredTopArtists:
     """Tests für get_filtered_top_artists Funktion."""
 
@@ -231,22 +306,6 @@ class TestFilteredTopArtists:
             }
         )
 
-    @pytest.fixture
-    def artist_blacklist(self, temp_blacklist_file):
-        """Erstellt ArtistBlacklist-Instanz."""
-        with patch("utils.artist_blacklist.ARTIST_BLACKLIST_FILE", temp_blacklist_file):
-            return ArtistBlacklist()
-
-    @pytest.fixture
-    def temp_blacklist_file(self):
-        """Temporäre Blacklist-Datei."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump({}, f)
-            temp_path = f.name
-        yield temp_path
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-
     def test_get_filtered_top_artists_no_blacklist(self, sample_counter, artist_blacklist):
         """Test: Gefilterte Top-Künstler ohne Blacklist-Einträge."""
         top_artists = get_filtered_top_artists(sample_counter, artist_blacklist, top_n=3)
@@ -286,22 +345,6 @@ class TestFilteredTopArtists:
 class TestUpdateArtistBlacklist:
     """Tests für update_artist_blacklist_from_search_results."""
 
-    @pytest.fixture
-    def artist_blacklist(self, temp_blacklist_file):
-        """Erstellt ArtistBlacklist-Instanz."""
-        with patch("utils.artist_blacklist.ARTIST_BLACKLIST_FILE", temp_blacklist_file):
-            return ArtistBlacklist()
-
-    @pytest.fixture
-    def temp_blacklist_file(self):
-        """Temporäre Blacklist-Datei."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump({}, f)
-            temp_path = f.name
-        yield temp_path
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-
     def test_update_no_albums_found(self, artist_blacklist):
         """Test: Keine Alben gefunden - auf Blacklist setzen."""
         update_artist_blacklist_from_search_results(
@@ -332,6 +375,15 @@ class TestUpdateArtistBlacklist:
 
         assert artist_blacklist.is_blacklisted("Previously Blacklisted") is False
 
+    def test_update_albums_found_removes_due_entry(self, artist_blacklist):
+        """Test: Alben gefunden - auch ein für Re-Check fälliger Eintrag wird entfernt."""
+        old_date = (datetime.now() - timedelta(days=400)).isoformat()
+        artist_blacklist.blacklist["due artist"] = {"artist_name": "Due Artist", "last_checked": old_date}
+
+        update_artist_blacklist_from_search_results("Due Artist", 12, found_new_albums=True, artist_blacklist=artist_blacklist)
+
+        assert "due artist" not in artist_blacklist.blacklist
+
 
 class TestSingleton:
     """Tests für Singleton-Pattern."""
@@ -342,7 +394,3 @@ class TestSingleton:
         instance2 = get_artist_blacklist()
 
         assert instance1 is instance2
-
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v", "--tb=short"])
@@ -3,7 +3,6 @@
 Unit Tests für Author-Matching Funktionalität
 """
 
-import pytest
 from library.search import (
     normalize_name,
     calculate_name_similarity,
@@ -121,6 +120,19 @@ class TestAuthorMatch:
         assert score < 0.7
         assert field == "no_match"
 
+    def test_normalized_candidates_are_reused(self):
+        """Test: Normalisierte Namen werden am Ergebnis zwischengespeichert"""
+        result = {"title": "Künstliche Intelligenz", "zentralbibliothek_info": "Person(en): Mühlhoff, Rainer Verfasser"}
+
+        check_author_match(result, "Rainer Mühlhoff")
+        cached = result["_normalized_candidates"]
+
+        assert check_author_match(result, "Mühlhoff")[0] is True
+        assert result["_normalized_candidates"] is cached
+
+        result["zentralbibliothek_info"] = "Person(en): Schmidt, Hans Verfasser"
+        assert check_author_match(result, "Rainer Mühlhoff")[0] is False
+
     def test_no_expected_author(self):
         """Test wenn kein Autor erwartet wird"""
         result = {"title": "Irgendein Buch", "zentralbibliothek_info": "Person(en): Jemand Verfasser"}
@@ -273,7 +285,3 @@ def test_full_workflow():
 
     # Sollte nach Score sortiert sein
     assert filtered[0]["author_match_score"] >= filtered[1]["author_match_score"]
-
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v", "--tb=short"])
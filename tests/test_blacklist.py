@@ -12,9 +12,34 @@ Ausführen:
     pytest tests/test_filters.py       # Einzelne Datei
 """
 
+import copy
 import pytest
-import tempfile
-from unittest.mock import patch
+from unittest.mock import Mock
+from utils import blacklist as blacklist_module
+from utils.blacklist import Blacklist, get_blacklist
+
+
+def _blacklist_files(directory):
+    """Blacklist-Dateipfade in einem Testverzeichnis"""
+    return {category: str(directory / f"blacklist_{category}.json") for category in ("films", "albums", "books")}
+
+
+@pytest.fixture(scope="session")
+def _blacklist_template(tmp_path_factory):
+    """Einmal pro Testlauf erstellte, leere Blacklist"""
+    directory = tmp_path_factory.mktemp("blacklist_template")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(blacklist_module, "BLACKLIST_FILES", _blacklist_files(directory))
+        return Blacklist()
+
+
+@pytest.fixture
+def blacklist(_blacklist_template, tmp_path, monkeypatch):
+    """Kopie der leeren Blacklist, die nur im Speicher arbeitet"""
+    monkeypatch.setattr(blacklist_module, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(blacklist_module, "BLACKLIST_FILES", _blacklist_files(tmp_path))
+    monkeypatch.setattr(Blacklist, "_save_blacklist", lambda self, category: None)
+    return copy.deepcopy(_blacklist_template)
 
 
 # ============================================================================
@@ -25,120 +50,129 @@ from unittest.mock import patch
 class TestBlacklist:
     """Tests für utils/blacklist.py"""
 
-    @pytest.fixture
-    def temp_blacklist_dir(self):
-        """Erstellt temporäres Verzeichnis für Blacklist-Dateien"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            yield tmpdir
-
-    def test_blacklist_init(self, temp_blacklist_dir):
+    def test_blacklist_init(self, blacklist):
         """Test Initialisierung von Blacklist"""
-        from utils.blacklist import Blacklist
-
-        with patch("utils.blacklist.DATA_DIR", temp_blacklist_dir):
-            blacklist = Blacklist()
-
-            assert "films" in blacklist.blacklists
-            assert "albums" in blacklist.blacklists
-            assert "books" in blacklist.blacklists
+        assert "films" in blacklist.blacklists
+        assert "albums" in blacklist.blacklists
+        assert "books" in blacklist.blacklists
 
-    def test_add_to_blacklist(self, temp_blacklist_dir):
+    def test_add_to_blacklist(self, blacklist):
         """Test Hinzufügen zur Blacklist"""
-        from utils.blacklist import Blacklist
+        item = {"title": "Test Film", "author": "Test Director", "type": "DVD"}
 
-        with patch("utils.blacklist.DATA_DIR", temp_blacklist_dir):
-            blacklist = Blacklist()
-            item = {"title": "Test Film", "author": "Test Director", "type": "DVD"}
+        blacklist.add_to_blacklist("films", item, reason="Test")
 
-            blacklist.add_to_blacklist("films", item, reason="Test")
+        assert len(blacklist.blacklists["films"]) == 1
+        assert blacklist.blacklists["films"][0]["title"] == "Test Film"
+        assert blacklist.blacklists["films"][0]["reason"] == "Test"
 
-            assert len(blacklist.blacklists["films"]) == 1
-            assert blacklist.blacklists["films"][0]["title"] == "Test Film"
-            assert blacklist.blacklists["films"][0]["reason"] == "Test"
-
-    def test_is_blacklisted(self, temp_blacklist_dir):
+    def test_is_blacklisted(self, blacklist):
         """Test is_blacklisted Methode"""
-        from utils.blacklist import Blacklist
-
-        with patch("utils.blacklist.DATA_DIR", temp_blacklist_dir):
-            blacklist = Blacklist()
-            item = {"title": "Unique Test Film 12345", "author": "Test Director", "type": "DVD"}
+        item = {"title": "Unique Test Film 12345", "author": "Test Director", "type": "DVD"}
 
-            # Initial nicht geblacklistet
-            assert not blacklist.is_blacklisted("films", item)
+        # Initial nicht geblacklistet
+        assert not blacklist.is_blacklisted("films", item)
 
-            # Nach Hinzufügen sollte es erkannt werden
-            blacklist.add_to_blacklist("films", item)
-            assert blacklist.is_blacklisted("films", item)
+        # Nach Hinzufügen sollte es erkannt werden
+        blacklist.add_to_blacklist("films", item)
+        assert blacklist.is_blacklisted("films", item)
 
-    def test_is_blacklisted_case_insensitive(self, temp_blacklist_dir):
+    def test_is_blacklisted_case_insensitive(self, blacklist):
         """Test dass Blacklist case-insensitive ist"""
-        from utils.blacklist import Blacklist
+        item1 = {"title": "Test Film", "author": "Test Director"}
+        item2 = {"title": "TEST FILM", "author": "TEST DIRECTOR"}
 
-        with patch("utils.blacklist.DATA_DIR", temp_blacklist_dir):
-            blacklist = Blacklist()
-            item1 = {"title": "Test Film", "author": "Test Director"}
-            item2 = {"title": "TEST FILM", "author": "TEST DIRECTOR"}
+        blacklist.add_to_blacklist("films", item1)
 
-            blacklist.add_to_blacklist("films", item1)
+        # Sollte auch mit anderem Case erkannt werden
+        assert blacklist.is_blacklisted("films", item2)
 
-            # Sollte auch mit anderem Case erkannt werden
-            assert blacklist.is_blacklisted("films", item2)
+    def test_is_blacklisted_author_rules(self, blacklist):
+        """Test Autorvergleich: ohne Autor auf einer Seite genügt der Titel"""
+        blacklist.add_to_blacklist("books", {"title": "Es", "author": "Stephen King"})
+        blacklist.add_to_blacklist("films", {"title": "Es", "author": ""})
 
-    def test_remove_from_blacklist(self, temp_blacklist_dir):
-        """Test Entfernen von Blacklist"""
-        from utils.blacklist import Blacklist
+        assert blacklist.is_blacklisted("books", {"title": "ES ", "author": "stephen king"})
+        assert blacklist.is_blacklisted("books", {"title": "Es"})
+        assert not blacklist.is_blacklisted("books", {"title": "Es", "author": "Andy Muschietti"})
+        assert blacklist.is_blacklisted("films", {"title": "Es", "author": "Andy Muschietti"})
 
-        with patch("utils.blacklist.DATA_DIR", temp_blacklist_dir):
-            blacklist = Blacklist()
-            item = {"title": "Test Film", "author": "Test Director", "type": "DVD"}
+        assert not blacklist.remove_from_blacklist("books", {"title": "Shining"})
+        assert blacklist.remove_from_blacklist("books", {"title": "Es", "author": "Stephen King"})
+        assert not blacklist.is_blacklisted("books", {"title": "Es"})
 
-            blacklist.add_to_blacklist("films", item)
-            assert blacklist.is_blacklisted("films", item)
+    def test_remove_from_blacklist(self, blacklist):
+        """Test Entfernen von Blacklist"""
+        item = {"title": "Test Film", "author": "Test Director", "type": "DVD"}
+
+        blacklist.add_to_blacklist("films", item)
+        assert blacklist.is_blacklisted("films", item)
 
-            removed = blacklist.remove_from_blacklist("films", item)
+        removed = blacklist.remove_from_blacklist("films", item)
 
-            assert removed is True
-            assert not blacklist.is_blacklisted("films", item)
+        assert removed is True
+        assert not blacklist.is_blacklisted("films", item)
 
-    def test_clear_blacklist(self, temp_blacklist_dir):
+    def test_clear_blacklist(self, blacklist):
         """Test clear_blacklist Methode"""
-        from utils.blacklist import Blacklist
+        # Füge Items hinzu
+        blacklist.add_to_blacklist("films", {"title": "Film 1", "author": "Director 1"})
+        blacklist.add_to_blacklist("albums", {"title": "Album 1", "author": "Artist 1"})
 
-        with patch("utils.blacklist.DATA_DIR", temp_blacklist_dir):
-            blacklist = Blacklist()
+        # Lösche nur Filme
+        blacklist.clear_blacklist("films")
 
-            # Füge Items hinzu
-            blacklist.add_to_blacklist("films", {"title": "Film 1", "author": "Director 1"})
-            blacklist.add_to_blacklist("albums", {"title": "Album 1", "author": "Artist 1"})
+        assert len(blacklist.blacklists["films"]) == 0
+        assert len(blacklist.blacklists["albums"]) == 1
+        assert not blacklist.is_blacklisted("films", {"title": "Film 1"})
 
-            # Lösche nur Filme
-            blacklist.clear_blacklist("films")
+        blacklist.clear_blacklist()
 
-            assert len(blacklist.blacklists["films"]) == 0
-            assert len(blacklist.blacklists["albums"]) == 1
+        assert not blacklist.is_blacklisted("albums", {"title": "Album 1"})
 
-    def test_get_blacklist_stats(self, temp_blacklist_dir):
+    def test_get_blacklist_stats(self, blacklist):
         """Test get_blacklist_stats Methode"""
-        from utils.blacklist import Blacklist
-
-        with patch("utils.blacklist.DATA_DIR", temp_blacklist_dir):
-            blacklist = Blacklist()
-
-            blacklist.add_to_blacklist("films", {"title": "Film 1", "author": "Director 1"})
-            blacklist.add_to_blacklist("films", {"title": "Film 2", "author": "Director 2"})
-            blacklist.add_to_blacklist("albums", {"title": "Album 1", "author": "Artist 1"})
-
-            stats = blacklist.get_blacklist_stats()
-
-            assert stats["films"]["count"] == 2
-            assert stats["albums"]["count"] == 1
-            assert stats["books"]["count"] == 0
-
-
-# ============================================================================
-# Pytest Configuration
-# ============================================================================
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v", "--tb=short"])
+        blacklist.add_to_blacklist("films", {"title": "Film 1", "author": "Director 1"})
+        blacklist.add_to_blacklist("films", {"title": "Film 2", "author": "Director 2"})
+        blacklist.add_to_blacklist("albums", {"title": "Album 1", "author": "Artist 1"})
+
+        stats = blacklist.get_blacklist_stats()
+
+        assert stats["films"]["count"] == 2
+        assert stats["albums"]["count"] == 1
+        assert stats["books"]["count"] == 0
+
+    def test_save_and_load_roundtrip(self, tmp_path, monkeypatch):
+        """Test gespeicherte Einträge werden beim nächsten Start wieder geladen"""
+        monkeypatch.setattr(blacklist_module, "DATA_DIR", str(tmp_path))
+        monkeypatch.setattr(blacklist_module, "BLACKLIST_FILES", _blacklist_files(tmp_path))
+
+        Blacklist().add_to_blacklist("albums", {"title": "OK Computer", "author": "Radiohead"})
+        reloaded = Blacklist()
+
+        assert reloaded.is_blacklisted("albums", {"title": "ok computer", "author": "Radiohead"})
+        assert not reloaded.blacklists["films"]
+
+    def test_categories_load_lazily(self, blacklist, monkeypatch):
+        """Test nur die abgefragte Kategorie wird von der Platte geladen"""
+        loaded = []
+        monkeypatch.setattr(Blacklist, "_load_blacklist", lambda self, category: loaded.append(category) or [])
+
+        blacklist.is_blacklisted("albums", {"title": "Abbey Road"})
+        blacklist.is_blacklisted("albums", {"title": "Revolver"})
+
+        assert loaded == ["albums"]
+
+    def test_get_blacklist_is_cached(self, monkeypatch):
+        """Test get_blacklist erstellt die Instanz nur einmal"""
+        mock_blacklist_cls = Mock()
+        monkeypatch.setattr(blacklist_module, "Blacklist", mock_blacklist_cls)
+        get_blacklist.cache_clear()
+        try:
+            first = get_blacklist()
+            second = get_blacklist()
+
+            assert first is second
+            mock_blacklist_cls.assert_called_once()
+        finally:
+            get_blacklist.cache_clear()
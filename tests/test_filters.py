@@ -14,7 +14,7 @@ Ausführen:
 
 import pytest
 import os
-import tempfile
+from preprocessing.filters import filter_existing_albums
 
 
 # ============================================================================
@@ -22,49 +22,65 @@ import tempfile
 # ============================================================================
 
 
+@pytest.fixture(scope="session")
+def empty_albums_dir(tmp_path_factory):
+    """Leeres Album-Verzeichnis, wird nur gelesen und daher geteilt"""
+    return str(tmp_path_factory.mktemp("empty_albums"))
+
+
 class TestFilters:
     """Tests für preprocessing/filters.py"""
 
     def test_filter_existing_albums_empty_list(self):
         """Test mit leerer Album-Liste"""
-        from preprocessing.filters import filter_existing_albums
-
         result = filter_existing_albums([], "/nonexistent/path")
         assert result == []
 
-    def test_filter_existing_albums_nonexistent_path(self):
+    def test_filter_existing_albums_nonexistent_path(self, monkeypatch):
         """Test mit nicht-existierendem Pfad"""
-        from preprocessing.filters import filter_existing_albums
-
+        monkeypatch.setattr("preprocessing.filters.os.path.exists", lambda path: False)
         albums = [{"author": "Radiohead", "title": "OK Computer", "source": "Test"}]
         result = filter_existing_albums(albums, "/nonexistent/path")
         # Sollte alle Alben zurückgeben, da Pfad nicht existiert
         assert len(result) == 1
         assert result[0]["title"] == "OK Computer"
 
-    def test_filter_existing_albums_with_mock_filesystem(self):
+    def test_filter_existing_albums_with_mock_filesystem(self, monkeypatch):
         """Test mit gemocktem Dateisystem"""
-        from preprocessing.filters import filter_existing_albums
+        albums = [
+            {"author": "Radiohead", "title": "OK Computer", "source": "Test"},
+            {"author": "Pink Floyd", "title": "Dark Side of the Moon", "source": "Test"},
+        ]
+
+        monkeypatch.setattr("preprocessing.filters.os.path.exists", lambda path: True)
+        monkeypatch.setattr(
+            "preprocessing.filters.os.walk",
+            lambda path: iter([(path, ["Radiohead - OK Computer"], [])]),
+        )
+
+        result = filter_existing_albums(albums, "/mp3")
 
+        assert len(result) == 1
+        assert result[0]["title"] == "Dark Side of the Moon"
+
+    def test_filter_existing_albums_with_real_filesystem(self, tmp_path):
+        """Integrationstest mit echtem Album-Ordner"""
         albums = [
             {"author": "Radiohead", "title": "OK Computer", "source": "Test"},
             {"author": "Pink Floyd", "title": "Dark Side of the Moon", "source": "Test"},
         ]
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Erstelle einen Ordner für ein vorhandenes Album
-            os.makedirs(os.path.join(tmpdir, "Radiohead - OK Computer"))
+        # Erstelle einen Ordner für ein vorhandenes Album
+        os.makedirs(os.path.join(tmp_path, "Radiohead - OK Computer"))
 
-            result = filter_existing_albums(albums, tmpdir)
+        result = filter_existing_albums(albums, str(tmp_path))
 
-            # Nur "Dark Side of the Moon" sollte zurückgegeben werden
-            assert len(result) == 1
-            assert result[0]["title"] == "Dark Side of the Moon"
+        # Nur "Dark Side of the Moon" sollte zurückgegeben werden
+        assert len(result) == 1
+        assert result[0]["title"] == "Dark Side of the Moon"
 
-    def test_filter_preserves_all_properties(self):
+    def test_filter_preserves_all_properties(self, empty_albums_dir):
         """Test dass alle Properties erhalten bleiben"""
-        from preprocessing.filters import filter_existing_albums
-
         albums = [
             {
                 "author": "Test Artist",
@@ -75,17 +91,8 @@ class TestFilters:
             }
         ]
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = filter_existing_albums(albums, tmpdir)
-
-            assert len(result) == 1
-            assert result[0]["custom_field"] == "custom_value"
-            assert result[0]["source"] == "Test Source"
+        result = filter_existing_albums(albums, empty_albums_dir)
 
-
-# ============================================================================
-# Pytest Configuration
-# ============================================================================
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v", "--tb=short"])
+        assert len(result) == 1
+        assert result[0]["custom_field"] == "custom_value"
+        assert result[0]["source"] == "Test Source"
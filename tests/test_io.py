@@ -12,9 +12,11 @@ Ausführen:
     pytest tests/test_filters.py       # Einzelne Datei
 """
 
-import pytest
 import os
-import tempfile
+import stat
+import pytest
+from utils import io as io_module
+from utils.io import load_json, save_json, save_recommendations_to_markdown
 
 
 # ============================================================================
@@ -25,40 +27,44 @@ import tempfile
 class TestIO:
     """Tests für utils/io.py"""
 
-    def test_save_recommendations_to_markdown(self):
+    def test_save_recommendations_to_markdown(self, tmp_path):
         """Test save_recommendations_to_markdown"""
-        from utils.io import save_recommendations_to_markdown
-
         recommendations = {
             "films": [{"title": "Test Film", "author": "Director", "bib_number": "verfügbar"}],
             "albums": [{"title": "Test Album", "author": "Artist", "bib_number": "ausgeliehen"}],
             "books": [],
         }
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".md", delete=False) as f:
-            filename = f.name
+        filename = str(tmp_path / "recommendations.md")
 
-        try:
-            result_filename = save_recommendations_to_markdown(recommendations, filename)
+        result_filename = save_recommendations_to_markdown(recommendations, filename)
 
-            assert os.path.exists(result_filename)
+        assert os.path.exists(result_filename)
 
-            with open(result_filename, "r", encoding="utf-8") as f:
-                content = f.read()
+        with open(result_filename, "r", encoding="utf-8") as f:
+            content = f.read()
 
-            assert "Test Film" in content
-            assert "Test Album" in content
-            assert "🎬 Filme" in content
-            assert "🎵 Musik/Alben" in content
+        assert "Test Film" in content
+        assert "Test Album" in content
+        assert "🎬 Filme" in content
+        assert "🎵 Musik/Alben" in content
 
-        finally:
-            if os.path.exists(filename):
-                os.remove(filename)
+    @pytest.mark.parametrize("mode", [0o644, 0o640])
+    def test_save_json_keeps_file_mode(self, tmp_path, mode):
+        """Test save_json behält die Zugriffsrechte einer vorhandenen Datei"""
+        path = tmp_path / "data.json"
+        path.write_text("{}", encoding="utf-8")
+        os.chmod(path, mode)
 
+        save_json(str(path), {"films": []})
 
-# ============================================================================
-# Pytest Configuration
-# ============================================================================
+        assert stat.S_IMODE(os.stat(path).st_mode) == mode
+        assert load_json(str(path)) == {"films": []}
+
+    def test_save_json_new_file_uses_umask(self, tmp_path):
+        """Test neue Dateien erhalten 0666 abzüglich umask statt 0600"""
+        path = tmp_path / "new.json"
+
+        save_json(str(path), [])
 
-if __name__ == "__main__":
-    pytest.main([__file__, "-v", "--tb=short"])
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~io_module._UMASK
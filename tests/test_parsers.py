@@ -13,6 +13,11 @@ Ausführen:
 """
 
 import pytest
+from library.parsers import normalize_text, create_search_variants, fuzzy_match
+
+# Suchvarianten für die Fuzzy-Matching-Tests, einmal beim Import erzeugt
+_RH_VARIANTS = create_search_variants("Radiohead", "OK Computer")
+_RH_VARIANTS_LOWER = create_search_variants("radiohead", "ok computer")
 
 
 # ============================================================================
@@ -23,37 +28,24 @@ import pytest
 class TestParsers:
     """Tests für library/parsers.py"""
 
-    def test_normalize_text_removes_stopwords(self):
-        """Test dass Füllwörter entfernt werden"""
-        from library.parsers import normalize_text
-
-        assert normalize_text("The Dark Side of the Moon") == "dark side moon"
-        assert normalize_text("A Day in the Life") == "day life"
-
-    def test_normalize_text_removes_special_chars(self):
-        """Test dass Sonderzeichen entfernt werden"""
-        from library.parsers import normalize_text
-
-        assert normalize_text("What's Going On?") == "what s going"
-        assert normalize_text("Rock & Roll!") == "rock roll"
-
-    def test_normalize_text_lowercase(self):
-        """Test dass Text in Kleinbuchstaben konvertiert wird"""
-        from library.parsers import normalize_text
-
-        assert normalize_text("UPPERCASE TEXT") == "uppercase text"
-
-    def test_normalize_text_empty_string(self):
-        """Test mit leerem String"""
-        from library.parsers import normalize_text
-
-        assert normalize_text("") == ""
-        assert normalize_text(None) == ""
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("The Dark Side of the Moon", "dark side moon"),  # Füllwörter
+            ("A Day in the Life", "day life"),
+            ("What's Going On?", "what s going"),  # Sonderzeichen
+            ("Rock & Roll!", "rock roll"),
+            ("UPPERCASE TEXT", "uppercase text"),  # Kleinbuchstaben
+            ("", ""),
+            (None, ""),
+        ],
+    )
+    def test_normalize_text(self, text, expected):
+        """Test Füllwörter, Sonderzeichen, Groß-/Kleinschreibung und leere Eingaben"""
+        assert normalize_text(text) == expected
 
     def test_create_search_variants_basic(self):
         """Test Erstellung von Suchvarianten"""
-        from library.parsers import create_search_variants
-
         variants = create_search_variants("Radiohead", "OK Computer")
 
         # Sollte mehrere Varianten enthalten
@@ -62,8 +54,6 @@ class TestParsers:
 
     def test_create_search_variants_with_brackets(self):
         """Test mit Klammern im Titel"""
-        from library.parsers import create_search_variants
-
         variants = create_search_variants("Oasis", "(What's The Story) Morning Glory?")
 
         # Sollte Variante ohne Klammern enthalten
@@ -71,26 +61,12 @@ class TestParsers:
 
     def test_fuzzy_match_exact(self):
         """Test Fuzzy-Matching mit exakter Übereinstimmung"""
-        from library.parsers import fuzzy_match, create_search_variants
-
-        search_terms = create_search_variants("Radiohead", "OK Computer")
         existing = "Radiohead - OK Computer"
 
-        assert fuzzy_match(search_terms, existing, "Radiohead", "OK Computer")
+        assert fuzzy_match(_RH_VARIANTS, existing, "Radiohead", "OK Computer")
 
     def test_fuzzy_match_case_insensitive(self):
         """Test Fuzzy-Matching case-insensitive"""
-        from library.parsers import fuzzy_match, create_search_variants
-
-        search_terms = create_search_variants("radiohead", "ok computer")
         existing = "RADIOHEAD - OK COMPUTER"
 
-        assert fuzzy_match(search_terms, existing, "radiohead", "ok computer")
-
-
-# ============================================================================
-# Pytest Configuration
-# ============================================================================
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v", "--tb=short"])
+        assert fuzzy_match(_RH_VARIANTS_LOWER, existing, "radiohead", "ok computer")
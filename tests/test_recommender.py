@@ -13,8 +13,24 @@ Ausführen:
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import Mock, MagicMock
 from collections import defaultdict
+from recommender.recommender import Recommender, CANDIDATE_OVERSAMPLE
+
+# Vorgefertigte Suchtreffer, die Stubs liefern Kopien davon
+_NO_UV_HIT = {"title": "Not a Film", "author": "Author", "zentralbibliothek_info": "verfügbar in Zentralbibliothek"}
+_BORROWED_HIT = {
+    "title": "Borrowed Film",
+    "author": "Director",
+    "zentralbibliothek_info": "Uv *Drama* Entliehen, voraussichtlich bis 15/12/2025",
+}
+_UV_HIT = {"title": "Test", "author": "Test Author", "zentralbibliothek_info": "Uv verfügbar"}
+
+
+def _search_stub(*hits):
+    """Stub für LibrarySearch, der bei jeder Anfrage Kopien der angegebenen Treffer liefert"""
+    return SimpleNamespace(search=lambda query: [dict(hit) for hit in hits])
 
 
 # ============================================================================
@@ -26,208 +42,290 @@ class TestRecommender:
     """Tests für recommender/recommender.py"""
 
     @pytest.fixture
-    def mock_library_search(self, sample_films):
-        """Mock mit dynamischen Antworten basierend auf Query."""
-        mock = Mock()
+    def mock_library_search(self):
+        """Stub, dessen Treffer die Anfrage (Titel, Autor, Typ) im Volltext enthält."""
 
         def mock_search(query):
-            # Suche passenden Film in sample_films
-            for film in sample_films:
-                if film["title"] in query:
-                    return [
-                        {
-                            "title": film["title"],
-                            "author": film["author"],
-                            "zentralbibliothek_info": f"Uv *Drama* verfügbar - {film['title']}",
-                        }
-                    ]
-
-            # Fallback
-            return [
-                {
-                    "title": sample_films[0]["title"],
-                    "author": sample_films[0]["author"],
-                    "zentralbibliothek_info": "Uv *Drama* verfügbar",
-                }
-            ]
-
-        mock.search = Mock(side_effect=mock_search)
-        return mock
+            return [{"title": query, "author": "", "zentralbibliothek_info": f"Uv *Drama* verfügbar - {query}"}]
+
+        # Aufrufe werden nicht geprüft, eine einfache Funktion genügt
+        return SimpleNamespace(search=mock_search)
 
     @pytest.fixture
-    def mock_state(self):
-        """Mock für AppState"""
-        from recommender.state import AppState
+    def recommender(self, mock_library_search, mock_state, recommender_factory):
+        """Recommender mit dem Such-Stub dieser Klasse"""
+        return recommender_factory(mock_library_search, mock_state)
+
+    @pytest.mark.parametrize(
+        ("method", "item"),
+        [
+            ("suggest_films", {"title": "Test Film", "author": "Test Director", "type": "DVD"}),
+            ("suggest_albums", {"title": "Test Album", "author": "Test Artist", "type": "CD"}),
+            ("suggest_books", {"title": "Test Book", "author": "Test Author", "type": "Buch"}),
+        ],
+    )
+    def test_suggest_with_available_items(self, recommender, method, item):
+        """Test suggest_* mit verfügbaren Items (Filme inkl. UV-Kürzel)"""
+        results = getattr(recommender, method)([dict(item, source="Test Source")], items_per_source=4)
+
+        assert len(results) == 1
+        assert results[0]["title"] == item["title"]
+        assert "bib_number" in results[0]
+
+    def test_suggest_films_without_uv_filtered(self, mock_state, mock_blacklist, recommender_factory):
+        """Test dass Filme ohne UV-Kürzel herausgefiltert werden"""
+        # Treffer ohne UV-Kürzel
+        mock_library_search = _search_stub(_NO_UV_HIT)
 
-        with patch("recommender.state.STATE_FILE", "/tmp/test_state.json"):
-            return AppState()
+        recommender = recommender_factory(mock_library_search, mock_state)
 
-    @pytest.fixture
-    def mock_blacklist(self):
-        """Mock für Blacklist"""
-        mock = Mock()
-        mock.is_blacklisted = Mock(return_value=False)
-        mock.add_to_blacklist = Mock()
-        return mock
+        films = [{"title": "Not a Film", "author": "Author", "type": "DVD", "source": "Test Source"}]
 
-    @pytest.fixture
-    def mock_borrowed_blacklist(self):
-        """Mock für BorrowedBlacklist"""
-        mock = Mock()
-        mock.is_blacklisted = Mock(return_value=False)
-        mock.add_to_blacklist = Mock()
-        return mock
+        results = recommender.suggest_films(films, items_per_source=4)
 
-    def test_suggest_films_with_available_items(
-        self, mock_library_search, mock_state, mock_blacklist, mock_borrowed_blacklist
-    ):
-        """Test suggest_films mit verfügbaren Items (inkl. UV-Kürzel)"""
-        from recommender.recommender import Recommender
+        # Sollte leer sein (kein UV-Kürzel)
+        assert len(results) == 0
+        # Sollte auf Blacklist gesetzt werden
+        mock_blacklist.add_to_blacklist.assert_called()
 
-        with patch("recommender.recommender.get_blacklist", return_value=mock_blacklist):
-            with patch("recommender.recommender.get_borrowed_blacklist", return_value=mock_borrowed_blacklist):
-                recommender = Recommender(mock_library_search, mock_state)
+    def test_suggest_films_uses_film_marker(self, recommender, monkeypatch):
+        """Test die Film-Erkennung nutzt das Kürzel aus _FILM_MARKER"""
+        monkeypatch.setattr("recommender.recommender._FILM_MARKER", "Dvd")
 
-                films = [{"title": "Test Film", "author": "Test Director", "type": "DVD", "source": "Test Source"}]
+        films = [{"title": "Test Film", "author": "Test Director", "type": "DVD", "source": "Test Source"}]
 
-                results = recommender.suggest_films(films, items_per_source=4)
+        # Der Stub liefert nur "Uv", mit geändertem Kürzel gilt der Treffer nicht als Film
+        assert recommender.suggest_films(films, items_per_source=4) == []
 
-                # Sollte 1 Film zurückgeben (hat UV-Kürzel)
-                assert len(results) == 1
-                assert results[0]["title"] == "Test Film"
-                assert "bib_number" in results[0]
+    def test_suggest_films_blacklisted_items(self, mock_library_search, mock_state, recommender_factory):
+        """Test suggest_films mit geblacklisteten Items"""
+        blacklisted = SimpleNamespace(is_blacklisted=lambda *args, **kwargs: True, add_to_blacklist=Mock())
 
-    def test_suggest_films_without_uv_filtered(self, mock_state, mock_blacklist, mock_borrowed_blacklist):
-        """Test dass Filme ohne UV-Kürzel herausgefiltert werden"""
-        from recommender.recommender import Recommender
+        recommender = recommender_factory(mock_library_search, mock_state, blacklist=blacklisted)
+
+        films = [{"title": "Blacklisted Film", "author": "Director", "type": "DVD", "source": "Test Source"}]
+
+        results = recommender.suggest_films(films, items_per_source=4)
+
+        # Sollte leer sein, da geblacklistet
+        assert len(results) == 0
+
+    def test_suggest_films_no_hits_adds_to_blacklist(self, mock_state, mock_blacklist, recommender_factory):
+        """Test dass Items ohne Treffer zur Blacklist hinzugefügt werden"""
+        mock_library_search = _search_stub()  # Keine Treffer
+
+        recommender = recommender_factory(mock_library_search, mock_state)
 
-        # Mock ohne UV-Kürzel
+        films = [{"title": "Unknown Film", "author": "Unknown", "type": "DVD", "source": "Test Source"}]
+
+        results = recommender.suggest_films(films, items_per_source=4)
+
+        # Sollte zur Blacklist hinzugefügt worden sein
+        mock_blacklist.add_to_blacklist.assert_called_once()
+        assert len(results) == 0
+
+    def test_suggest_films_borrowed_items(self, mock_state, mock_borrowed_blacklist, recommender_factory):
+        """Test dass entliehene Filme auf Entleih-Blacklist kommen"""
+        # Treffer mit entliehenem Film (mit UV!)
+        mock_library_search = _search_stub(_BORROWED_HIT)
+
+        recommender = recommender_factory(mock_library_search, mock_state)
+
+        films = [{"title": "Borrowed Film", "author": "Director", "type": "DVD", "source": "Test Source"}]
+
+        results = recommender.suggest_films(films, items_per_source=4)
+
+        # Sollte leer sein (entliehen)
+        assert len(results) == 0
+        # Sollte auf Entleih-Blacklist gesetzt werden
+        mock_borrowed_blacklist.add_to_blacklist.assert_called()
+
+    def test_suggest_all(self, mock_state, recommender_factory):
+        """Test suggest_all liefert Vorschläge für alle Kategorien"""
+        mock_library_search = _search_stub(_UV_HIT)
+
+        recommender = recommender_factory(mock_library_search, mock_state)
+
+        groups = {
+            "films": [{"title": "Test Film", "author": "Test Author", "type": "DVD", "source": "Test Source"}],
+            "books": [{"title": "Test Book", "author": "Test Author", "type": "Buch", "source": "Test Source"}],
+        }
+
+        results = recommender.suggest_all(groups, items_per_source=4)
+
+        assert set(results.keys()) == {"films", "books"}
+        assert results["films"][0]["title"] == "Test Film"
+        assert results["books"][0]["title"] == "Test Book"
+
+    def test_precomputed_query_and_clean_result(self, mock_state, recommender_factory):
+        """Test vorberechnete Suchanfrage wird genutzt und interne Felder nicht zurückgegeben"""
         mock_library_search = Mock()
         mock_library_search.search = Mock(
-            return_value=[
-                {
-                    "title": "Not a Film",
-                    "author": "Author",
-                    "zentralbibliothek_info": "verfügbar in Zentralbibliothek",  # Kein "Uv"!
-                }
-            ]
+            return_value=[{"title": "Test Book", "author": "Test Author", "zentralbibliothek_info": "verfügbar"}]
         )
 
-        with patch("recommender.recommender.get_blacklist", return_value=mock_blacklist):
-            with patch("recommender.recommender.get_borrowed_blacklist", return_value=mock_borrowed_blacklist):
-                recommender = Recommender(mock_library_search, mock_state)
+        recommender = recommender_factory(mock_library_search, mock_state)
 
-                films = [{"title": "Not a Film", "author": "Author", "type": "DVD", "source": "Test Source"}]
+        books = [{"title": "Test Book", "author": "Test Author", "type": "Buch", "source": "Test Source"}]
+        results = recommender.suggest_books(books)
 
-                results = recommender.suggest_films(films, items_per_source=4)
+        mock_library_search.search.assert_called_once_with("Test Author Test Book Buch")
+        assert len(results) == 1
+        assert not any(key.startswith("_") for key in results[0])
 
-                # Sollte leer sein (kein UV-Kürzel)
-                assert len(results) == 0
-                # Sollte auf Blacklist gesetzt werden
-                mock_blacklist.add_to_blacklist.assert_called()
+    def test_suggest_does_not_modify_items(self, mock_state, mock_blacklist, recommender_factory):
+        """Test Vorschläge legen keine internen Felder an den übergebenen Items ab"""
+        mock_library_search = _search_stub(_UV_HIT)
+        recommender = recommender_factory(mock_library_search, mock_state)
 
-    def test_suggest_films_blacklisted_items(self, mock_library_search, mock_state, mock_borrowed_blacklist):
-        """Test suggest_films mit geblacklisteten Items"""
-        from recommender.recommender import Recommender
+        films = [{"title": f"Film {i}", "author": "", "type": "DVD", "source": "Test Source"} for i in range(3)]
+        originals = [dict(film) for film in films]
 
-        mock_blacklist = Mock()
-        mock_blacklist.is_blacklisted = Mock(return_value=True)
+        recommender.suggest_films(films, n=2)
 
-        with patch("recommender.recommender.get_blacklist", return_value=mock_blacklist):
-            with patch("recommender.recommender.get_borrowed_blacklist", return_value=mock_borrowed_blacklist):
-                recommender = Recommender(mock_library_search, mock_state)
+        assert films == originals
 
-                films = [{"title": "Blacklisted Film", "author": "Director", "type": "DVD", "source": "Test Source"}]
+    def test_prefetched_searches_keep_item_order(self, mock_state, mock_blacklist, recommender_factory):
+        """Test parallele Vorabsuchen ändern die Reihenfolge der Auswahl nicht"""
 
-                results = recommender.suggest_films(films, items_per_source=4)
+        def mock_search(query):
+            if query.startswith("Film 0"):
+                return []
+            return [{"title": query, "author": "", "zentralbibliothek_info": "Uv verfügbar"}]
 
-                # Sollte leer sein, da geblacklistet
-                assert len(results) == 0
+        mock_library_search = SimpleNamespace(search=mock_search)
 
-    def test_suggest_films_no_hits_adds_to_blacklist(self, mock_state, mock_blacklist, mock_borrowed_blacklist):
-        """Test dass Items ohne Treffer zur Blacklist hinzugefügt werden"""
-        from recommender.recommender import Recommender
+        recommender = recommender_factory(mock_library_search, mock_state)
 
-        mock_library_search = Mock()
-        mock_library_search.search = Mock(return_value=[])  # Keine Treffer
+        films = [{"title": f"Film {i}", "type": "DVD", "source": "Test Source"} for i in range(20)]
+        results = recommender.suggest_films(films, n=1, items_per_source=1)
+        recommender.close()
 
-        with patch("recommender.recommender.get_blacklist", return_value=mock_blacklist):
-            with patch("recommender.recommender.get_borrowed_blacklist", return_value=mock_borrowed_blacklist):
-                recommender = Recommender(mock_library_search, mock_state)
+        assert [r["title"] for r in results] == ["Film 1"]
+        mock_blacklist.add_to_blacklist.assert_called_once()
 
-                films = [{"title": "Unknown Film", "author": "Unknown", "type": "DVD", "source": "Test Source"}]
+    @pytest.mark.parametrize("n", [1, 5])
+    def test_no_extra_searches_once_target_reached(self, mock_state, recommender_factory, n):
+        """Test nach Erreichen der Zielanzahl werden keine weiteren Suchen gestartet"""
+        mock_library_search = Mock()
+        mock_library_search.search = Mock(
+            side_effect=lambda query: [{"title": query, "author": "", "zentralbibliothek_info": "Uv verfügbar"}]
+        )
 
-                results = recommender.suggest_films(films, items_per_source=4)
+        recommender = recommender_factory(mock_library_search, mock_state)
 
-                # Sollte zur Blacklist hinzugefügt worden sein
-                mock_blacklist.add_to_blacklist.assert_called_once()
-                assert len(results) == 0
+        films = [{"title": f"Film {i}", "type": "DVD", "source": "Test Source"} for i in range(20)]
+        results = recommender.suggest_films(films, n=n, items_per_source=n)
 
-    def test_suggest_films_borrowed_items(self, mock_state, mock_blacklist, mock_borrowed_blacklist):
-        """Test dass entliehene Filme auf Entleih-Blacklist kommen"""
-        from recommender.recommender import Recommender
+        assert len(results) == n
+        assert mock_library_search.search.call_count == n
 
-        # Mock mit entliehenem Film (mit UV!)
+    def test_one_search_per_item_when_all_available(self, mock_state, recommender_factory):
+        """Test sind alle Kandidaten verfügbar, wird pro Vorschlag genau eine Suche gestellt"""
         mock_library_search = Mock()
         mock_library_search.search = Mock(
-            return_value=[
-                {
-                    "title": "Borrowed Film",
-                    "author": "Director",
-                    "zentralbibliothek_info": "Uv *Drama* Entliehen, voraussichtlich bis 15/12/2025",
-                }
-            ]
+            side_effect=lambda query: [{"title": query, "author": "", "zentralbibliothek_info": "Uv verfügbar"}]
         )
 
-        with patch("recommender.recommender.get_blacklist", return_value=mock_blacklist):
-            with patch("recommender.recommender.get_borrowed_blacklist", return_value=mock_borrowed_blacklist):
-                recommender = Recommender(mock_library_search, mock_state)
+        recommender = recommender_factory(mock_library_search, mock_state)
 
-                films = [{"title": "Borrowed Film", "author": "Director", "type": "DVD", "source": "Test Source"}]
+        films = [{"title": f"Film {s}{i}", "type": "DVD", "source": f"Quelle {s}"} for s in "ABC" for i in range(10)]
+        results = recommender.suggest_films(films, n=12, items_per_source=4)
 
-                results = recommender.suggest_films(films, items_per_source=4)
+        assert len(results) == 12
+        assert mock_library_search.search.call_count == 12
 
-                # Sollte leer sein (entliehen)
-                assert len(results) == 0
-                # Sollte auf Entleih-Blacklist gesetzt werden
-                mock_borrowed_blacklist.add_to_blacklist.assert_called()
+    def test_suggest_shuffle_keeps_balance(self, mock_state, recommender_factory):
+        """Test shuffle mischt nur innerhalb der Quellen und verändert die Eingabe nicht"""
+        mock_library_search = SimpleNamespace(
+            search=lambda query: [{"title": query, "author": "", "zentralbibliothek_info": "Uv verfügbar"}]
+        )
 
-    def test_suggest_albums(self, mock_library_search, mock_state, mock_blacklist, mock_borrowed_blacklist):
-        """Test suggest_albums (keine UV-Filterung für Alben)"""
-        from recommender.recommender import Recommender
+        recommender = recommender_factory(mock_library_search, mock_state)
 
-        with patch("recommender.recommender.get_blacklist", return_value=mock_blacklist):
-            with patch("recommender.recommender.get_borrowed_blacklist", return_value=mock_borrowed_blacklist):
-                recommender = Recommender(mock_library_search, mock_state)
+        films = [{"title": f"Film {s}{i}", "type": "DVD", "source": f"Quelle {s}"} for s in "AB" for i in range(10)]
+        titles_before = [film["title"] for film in films]
 
-                albums = [{"title": "Test Album", "author": "Test Artist", "type": "CD", "source": "Test Source"}]
+        results = recommender.suggest("films", films, n=4, items_per_source=2, shuffle=True)
 
-                results = recommender.suggest_albums(albums, items_per_source=4)
+        assert [film["title"] for film in films] == titles_before
+        assert sorted(r["source"] for r in results) == ["Quelle A", "Quelle A", "Quelle B", "Quelle B"]
 
-                # Sollte 1 Album zurückgeben
-                assert len(results) == 1
-                assert results[0]["title"] == "Test Album"
+    def test_lookup_budget_limits_searches(self, mock_state, recommender_factory):
+        """Test pro Quelle werden höchstens items_per_source * CANDIDATE_OVERSAMPLE Suchen gestellt"""
+        mock_library_search = Mock()
+        mock_library_search.search = Mock(return_value=[])
 
-    def test_suggest_books(self, mock_library_search, mock_state, mock_blacklist, mock_borrowed_blacklist):
-        """Test suggest_books (keine UV-Filterung für Bücher)"""
-        from recommender.recommender import Recommender
+        recommender = recommender_factory(mock_library_search, mock_state)
 
-        with patch("recommender.recommender.get_blacklist", return_value=mock_blacklist):
-            with patch("recommender.recommender.get_borrowed_blacklist", return_value=mock_borrowed_blacklist):
-                recommender = Recommender(mock_library_search, mock_state)
+        films = [{"title": f"Film {i}", "type": "DVD", "source": f"Quelle {i % 3}"} for i in range(60)]
+        results = recommender.suggest_films(films, n=2, items_per_source=1)
 
-                books = [{"title": "Test Book", "author": "Test Author", "type": "Buch", "source": "Test Source"}]
+        assert results == []
+        assert mock_library_search.search.call_count == 3 * CANDIDATE_OVERSAMPLE
 
-                results = recommender.suggest_books(books, items_per_source=4)
+    def test_unavailable_source_does_not_starve_others(self, mock_state, mock_blacklist, recommender_factory):
+        """Test eine Quelle mit mehr als n * CANDIDATE_OVERSAMPLE Fehltreffern verdrängt die übrigen nicht"""
+        queries = []
 
-                # Sollte 1 Buch zurückgeben
-                assert len(results) == 1
-                assert results[0]["title"] == "Test Book"
+        def mock_search(query):
+            queries.append(query)
+            if query.startswith("Fehlt"):
+                return []
+            return [{"title": query, "author": "", "zentralbibliothek_info": "Uv verfügbar"}]
 
+        recommender = recommender_factory(SimpleNamespace(search=mock_search), mock_state)
 
-# ============================================================================
-# Pytest Configuration
-# ============================================================================
+        n = 6
+        films = [{"title": f"Fehlt {i}", "type": "DVD", "source": "Quelle A"} for i in range(n * CANDIDATE_OVERSAMPLE + 10)]
+        films += [{"title": f"Film {s}{i}", "type": "DVD", "source": f"Quelle {s}"} for s in "BC" for i in range(5)]
+
+        results = recommender.suggest("films", films, n=n, items_per_source=2)
+
+        assert sorted(r["source"] for r in results) == ["Quelle B", "Quelle B", "Quelle C", "Quelle C"]
+        assert sum(query.startswith("Fehlt") for query in queries) == 2 * CANDIDATE_OVERSAMPLE
+
+    def test_unused_budget_passes_to_later_sources(self, mock_state, mock_blacklist, recommender_factory):
+        """Test nicht verbrauchtes Budget einer gesättigten Quelle steht den übrigen zur Verfügung"""
+
+        def mock_search(query):
+            if query.startswith("Fehlt"):
+                return []
+            return [{"title": query, "author": "", "zentralbibliothek_info": "Uv verfügbar"}]
+
+        recommender = recommender_factory(SimpleNamespace(search=mock_search), mock_state)
+
+        films = [{"title": "Film A", "type": "DVD", "source": "Quelle A"}]
+        films += [{"title": f"Fehlt {i}", "type": "DVD", "source": "Quelle B"} for i in range(2)]
+        films += [{"title": "Film B", "type": "DVD", "source": "Quelle B"}]
+
+        # Quelle B braucht drei Anfragen, hat selbst aber nur zwei
+        results = recommender.suggest("films", films, n=2, items_per_source=1, candidate_oversample=2)
+
+        assert [r["title"] for r in results] == ["Film A", "Film B"]
+
+    def test_search_results_are_cached(self, mock_state, recommender_factory):
+        """Test wiederholte Suchanfragen werden aus dem Zwischenspeicher bedient"""
+        mock_library_search = Mock()
+        mock_library_search.search = Mock(
+            return_value=[{"title": "Test Film", "author": "", "zentralbibliothek_info": "Uv verfügbar"}]
+        )
+
+        recommender = recommender_factory(mock_library_search, mock_state)
+        item = {"title": "Test Film", "type": "DVD"}
+
+        first = recommender._search_item(item)
+        second = recommender._search_item({"title": "TEST FILM", "type": "DVD"})
+
+        assert first == second
+        mock_library_search.search.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "parts",
+        [[], ["kurz"], ["a" * 150, "b" * 150], ["a" * 149, "b" * 149], ["x " * 100] * 10],
+    )
+    def test_join_truncated_matches_join_and_truncate(self, parts):
+        """Test _join_truncated liefert dasselbe wie join + _truncate_text"""
+        expected = Recommender._truncate_text(", ".join(parts), max_length=300)
 
-if __name__ == "__main__":
-    pytest.main([__file__, "-v", "--tb=short"])
+        assert Recommender._join_truncated(parts, max_length=300) == expected
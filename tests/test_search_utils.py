@@ -13,6 +13,7 @@ Ausführen:
 """
 
 import pytest
+from utils.search_utils import extract_title_and_author
 
 
 # ============================================================================
@@ -23,37 +24,14 @@ import pytest
 class TestSearchUtils:
     """Tests für utils/search_utils.py"""
 
-    def test_extract_title_and_author_with_separator(self):
-        """Test extract_title_and_author mit Separator"""
-        from utils.search_utils import extract_title_and_author
-
-        title, author = extract_title_and_author("Test Film - Test Director")
-
-        assert title == "Test Film"
-        assert author == "Test Director"
-
-    def test_extract_title_and_author_without_separator(self):
-        """Test extract_title_and_author ohne Separator"""
-        from utils.search_utils import extract_title_and_author
-
-        title, author = extract_title_and_author("Test Film")
-
-        assert title == "Test Film"
-        assert author is None
-
-    def test_extract_title_and_author_with_whitespace(self):
-        """Test extract_title_and_author mit Whitespace"""
-        from utils.search_utils import extract_title_and_author
-
-        title, author = extract_title_and_author("  Test Film  -  Test Director  ")
-
-        assert title == "Test Film"
-        assert author == "Test Director"
-
-
-# ============================================================================
-# Pytest Configuration
-# ============================================================================
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v", "--tb=short"])
+    @pytest.mark.parametrize(
+        ("text", "expected_title", "expected_author"),
+        [
+            ("Test Film - Test Director", "Test Film", "Test Director"),  # mit Separator
+            ("Test Film", "Test Film", None),  # ohne Separator
+            ("  Test Film  -  Test Director  ", "Test Film", "Test Director"),  # mit Whitespace
+        ],
+    )
+    def test_extract_title_and_author(self, text, expected_title, expected_author):
+        """Test extract_title_and_author mit und ohne Separator"""
+        assert extract_title_and_author(text) == (expected_title, expected_author)
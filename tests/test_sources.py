@@ -13,6 +13,14 @@ Ausführen:
 """
 
 import pytest
+from utils.sources import (
+    get_source_emoji,
+    format_source_for_display,
+    SOURCE_OSCAR_BEST_PICTURE,
+    SOURCE_BBC_100_FILMS,
+    SOURCE_EMOJIS,
+    SOURCE_TOP_ARTIST,
+)
 
 
 # ============================================================================
@@ -23,38 +31,27 @@ import pytest
 class TestSources:
     """Tests für utils/sources.py"""
 
-    def test_get_source_emoji_known_sources(self):
-        """Test get_source_emoji mit bekannten Quellen"""
-        from utils.sources import get_source_emoji, SOURCE_OSCAR_BEST_PICTURE, SOURCE_BBC_100_FILMS
-
-        assert get_source_emoji(SOURCE_OSCAR_BEST_PICTURE) == "🏆"
-        assert get_source_emoji(SOURCE_BBC_100_FILMS) == "🎬"
-
-    def test_get_source_emoji_personalized(self):
-        """Test get_source_emoji mit personalisierten Empfehlungen"""
-        from utils.sources import get_source_emoji
-
-        source = "Interessant für dich (Top-Interpret: Radiohead)"
-        assert get_source_emoji(source) == "💎"
-
-    def test_get_source_emoji_unknown(self):
-        """Test get_source_emoji mit unbekannter Quelle"""
-        from utils.sources import get_source_emoji
-
-        assert get_source_emoji("Unknown Source") == ""
+    @pytest.mark.parametrize(
+        ("source", "expected"),
+        [
+            (SOURCE_OSCAR_BEST_PICTURE, "🏆"),
+            (SOURCE_BBC_100_FILMS, "🎬"),
+            (SOURCE_TOP_ARTIST("Radiohead"), "💎"),  # personalisiert
+            ("Unknown Source", ""),
+            ("", ""),
+        ],
+    )
+    def test_get_source_emoji(self, source, expected):
+        """Test get_source_emoji mit bekannten, personalisierten und unbekannten Quellen"""
+        assert get_source_emoji(source) == expected
+
+    def test_get_source_emoji_covers_emoji_table(self):
+        """Test alle Einträge der Emoji-Tabelle werden per Dict-Lookup gefunden"""
+        assert isinstance(SOURCE_EMOJIS, dict)
+        assert all(get_source_emoji(source) == emoji for source, emoji in SOURCE_EMOJIS.items())
 
     def test_format_source_for_display(self):
         """Test format_source_for_display"""
-        from utils.sources import format_source_for_display, SOURCE_OSCAR_BEST_PICTURE
-
         formatted = format_source_for_display(SOURCE_OSCAR_BEST_PICTURE)
         assert "🏆" in formatted
         assert SOURCE_OSCAR_BEST_PICTURE in formatted
-
-
-# ============================================================================
-# Pytest Configuration
-# ============================================================================
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v", "--tb=short"])
@@ -12,11 +12,14 @@ Ausführen:
     pytest tests/test_filters.py       # Einzelne Datei
 """
 
+import gc
 import pytest
 import os
 import json
-import tempfile
-from unittest.mock import patch
+import weakref
+from unittest.mock import Mock
+from recommender import state as state_module
+from recommender.state import AppState
 
 
 # ============================================================================
@@ -28,110 +31,182 @@ class TestAppState:
     """Tests für recommender/state.py"""
 
     @pytest.fixture
-    def temp_state_file(self):
-        """Erstellt temporäre state.json für Tests"""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump({"films": [], "albums": [], "books": []}, f)
-            temp_path = f.name
+    def mock_save(self, monkeypatch):
+        """Ersetzt AppState.save_rejected_state durch einen Mock"""
+        mock = Mock()
+        monkeypatch.setattr(AppState, "save_rejected_state", mock)
+        return mock
 
-        yield temp_path
-
-        # Cleanup
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+    @pytest.fixture
+    def state(self, temp_state_file, mock_save):
+        """Frischer AppState auf der temporären state.json, Speichern ist gemockt"""
+        state = AppState()
+        yield state
+        state.close()
 
-    def test_app_state_init(self):
+    def test_app_state_init(self, state):
         """Test Initialisierung von AppState"""
-        from recommender.state import AppState
+        assert "films" in state.rejected
+        assert "albums" in state.rejected
+        assert "books" in state.rejected
+        assert isinstance(state.suggested, dict)
 
-        with patch("recommender.state.STATE_FILE", "/tmp/test_state.json"):
-            state = AppState()
+    def test_mark_suggested(self, state):
+        """Test mark_suggested Methode"""
+        item = {"title": "Test Film", "author": "Test Director"}
 
-            assert "films" in state.rejected
-            assert "albums" in state.rejected
-            assert "books" in state.rejected
-            assert isinstance(state.suggested, dict)
+        state.mark_suggested("films", item)
 
-    def test_mark_suggested(self):
-        """Test mark_suggested Methode"""
-        from recommender.state import AppState
+        assert len(state.suggested["films"]) == 1
+        assert state.suggested["films"][0]["title"] == "Test Film"
 
-        with patch("recommender.state.STATE_FILE", "/tmp/test_state.json"):
-            state = AppState()
-            item = {"title": "Test Film", "author": "Test Director"}
+    def test_is_already_suggested(self, state):
+        """Test is_already_suggested Methode"""
+        item = {"title": "Test Film", "author": "Test Director"}
 
-            state.mark_suggested("films", item)
+        # Initial nicht vorgeschlagen
+        assert not state.is_already_suggested("films", item)
 
-            assert len(state.suggested["films"]) == 1
-            assert state.suggested["films"][0]["title"] == "Test Film"
+        # Nach mark_suggested sollte es erkannt werden
+        state.mark_suggested("films", item)
+        assert state.is_already_suggested("films", item)
 
-    def test_is_already_suggested(self):
-        """Test is_already_suggested Methode"""
-        from recommender.state import AppState
+    def test_is_already_suggested_casefold(self, state):
+        """Test Titelvergleich nutzt casefold (ß entspricht ss)"""
+        state.mark_suggested("films", {"title": "Die Straße"})
 
-        with patch("recommender.state.STATE_FILE", "/tmp/test_state.json"):
-            state = AppState()
-            item = {"title": "Test Film", "author": "Test Director"}
+        assert state.is_already_suggested("films", {"title": "DIE STRASSE"})
 
-            # Initial nicht vorgeschlagen
-            assert not state.is_already_suggested("films", item)
+    def test_reject_stores_item_without_internal_keys(self, state):
+        """Test abgelehnte Items werden ohne zwischengespeicherte Schlüssel abgelegt"""
+        item = {"title": "Test Film", "author": "Test Director"}
 
-            # Nach mark_suggested sollte es erkannt werden
-            state.mark_suggested("films", item)
-            assert state.is_already_suggested("films", item)
+        assert not state.is_already_suggested("films", item)
+        state.reject("films", item)
+        state.save()
 
-    def test_reject_item(self):
-        """Test reject Methode"""
-        from recommender.state import AppState
+        assert state.rejected["films"] == [{"title": "Test Film", "author": "Test Director"}]
 
-        with patch("recommender.state.STATE_FILE", "/tmp/test_state.json"):
-            with patch.object(AppState, "save_rejected_state"):
-                state = AppState()
-                item = {"title": "Test Film", "author": "Test Director"}
+    def test_suggested_items_stay_unchanged(self, state):
+        """Test Abfragen und Vorschläge legen keine internen Felder am Item ab"""
+        item = {"title": "Test Film", "author": "Test Director"}
 
-                state.reject("films", item)
+        assert not state.is_already_suggested("films", item)
+        state.mark_suggested("films", item)
 
-                assert len(state.rejected["films"]) == 1
-                assert state.rejected["films"][0]["title"] == "Test Film"
+        assert state.suggested["films"] == [{"title": "Test Film", "author": "Test Director"}]
 
-    def test_reject_duplicate_prevention(self):
+    def test_reject_item(self, state):
+        """Test reject Methode"""
+        item = {"title": "Test Film", "author": "Test Director"}
+
+        state.reject("films", item)
+        state.save()
+
+        assert len(state.rejected["films"]) == 1
+        assert state.rejected["films"][0]["title"] == "Test Film"
+
+    def test_reject_duplicate_prevention(self, state):
         """Test dass Duplikate nicht mehrfach abgelehnt werden"""
-        from recommender.state import AppState
+        item = {"title": "Test Film", "author": "Test Director"}
 
-        with patch("recommender.state.STATE_FILE", "/tmp/test_state.json"):
-            with patch.object(AppState, "save_rejected_state"):
-                state = AppState()
-                item = {"title": "Test Film", "author": "Test Director"}
+        state.reject("films", item)
+        state.reject("films", item)  # Zweiter Versuch
+        state.save()
 
-                state.reject("films", item)
-                state.reject("films", item)  # Zweiter Versuch
+        # Sollte nur einmal vorhanden sein
+        assert len(state.rejected["films"]) == 1
 
-                # Sollte nur einmal vorhanden sein
-                assert len(state.rejected["films"]) == 1
+    def test_many_items_use_index(self, state):
+        """Test 2.000 Items werden über die Set-Indizes erkannt, Duplikate nicht doppelt abgelegt"""
+        items = [{"title": f"Film {i}", "author": ""} for i in range(2_000)]
 
-    def test_get_stats(self):
-        """Test get_stats Methode"""
-        from recommender.state import AppState
+        for item in items:
+            state.mark_suggested("films", item)
+            state.reject("albums", item)
+            state.reject("albums", {"title": item["title"].upper()})
+        state.save()
 
-        with patch("recommender.state.STATE_FILE", "/tmp/test_state.json"):
-            with patch.object(AppState, "save_rejected_state"):
-                state = AppState()
+        assert len(state.suggested["films"]) == 2_000
+        assert len(state.rejected["albums"]) == 2_000
+        assert all(state.is_already_suggested("films", item) for item in items)
+        assert all(state.is_already_suggested("albums", {"title": item["title"]}) for item in items)
 
-                # Füge Testdaten hinzu
-                state.mark_suggested("films", {"title": "Film 1", "author": "Director 1"})
-                state.reject("albums", {"title": "Album 1", "author": "Artist 1"})
+    def test_rejected_from_file_and_reset(self, temp_state_file, mock_save):
+        """Test geladene Ablehnungen werden erkannt und reset_* leert die Indizes"""
+        with open(temp_state_file, "w", encoding="utf-8") as f:
+            json.dump({"films": [{"title": "Alter Film", "author": ""}], "albums": [], "books": []}, f)
 
-                stats = state.get_stats()
+        state = AppState()
 
-                assert stats["suggested_total"] == 1
-                assert stats["rejected_total"] == 1
-                assert stats["suggested_by_category"]["films"] == 1
-                assert stats["rejected_by_category"]["albums"] == 1
+        assert state.is_already_suggested("films", {"title": "ALTER FILM"})
 
+        state.mark_suggested("books", {"title": "Buch"})
+        state.reset_rejected()
+        state.reset_suggested()
 
-# ============================================================================
-# Pytest Configuration
-# ============================================================================
+        assert not state.is_already_suggested("films", {"title": "Alter Film"})
+        assert not state.is_already_suggested("books", {"title": "Buch"})
+
+    def test_rejects_are_saved_together(self, state, mock_save):
+        """Test mehrere Ablehnungen führen zu einem einzigen Speichervorgang"""
+        for i in range(5):
+            state.reject("films", {"title": f"Film {i}", "author": ""})
+
+        mock_save.assert_not_called()
+
+        state.save()
+        state.save()  # Nichts mehr zu speichern
+
+        mock_save.assert_called_once()
+
+    def test_close_saves_and_stops_timer(self, state, mock_save):
+        """Test close speichert sofort und hinterlässt keinen laufenden Timer"""
+        state.reject("films", {"title": "Film", "author": ""})
+        assert state in state_module._dirty_states
+
+        state.close()
+
+        mock_save.assert_called_once()
+        assert state._save_timer is None
+        assert state not in state_module._dirty_states
+
+    def test_unused_state_is_released(self, temp_state_file, mock_save):
+        """Test AppState-Instanzen werden nicht bis zum Programmende festgehalten"""
+        ref = weakref.ref(AppState())
+        gc.collect()
+
+        assert ref() is None
+
+    def test_save_and_load_roundtrip(self, temp_state_file):
+        """Test gespeicherte Ablehnungen werden unverändert wieder geladen"""
+        rejected = {"films": [{"title": "Die fabelhafte Welt der Amélie", "author": "Jeunet"}], "albums": [], "books": []}
+
+        AppState.save_rejected_state(rejected)
+
+        assert AppState.load_rejected_state() == rejected
+
+    def test_failed_save_keeps_previous_file(self, temp_state_file):
+        """Test ein fehlgeschlagenes Speichern lässt die alte state.json intakt"""
+        rejected = {"films": [{"title": "Film", "author": ""}], "albums": [], "books": []}
+
+        AppState.save_rejected_state(rejected)
+        AppState.save_rejected_state({"films": [{"title": object()}], "albums": [], "books": []})
+
+        assert AppState.load_rejected_state() == rejected
+        leftovers = [name for name in os.listdir(os.path.dirname(temp_state_file)) if name.endswith(".tmp")]
+        assert not any(name.startswith(os.path.basename(temp_state_file)) for name in leftovers)
+
+    def test_get_stats(self, state):
+        """Test get_stats Methode"""
+        # Füge Testdaten hinzu
+        state.mark_suggested("films", {"title": "Film 1", "author": "Director 1"})
+        state.reject("albums", {"title": "Album 1", "author": "Artist 1"})
+        state.save()
+
+        stats = state.get_stats()
 
-if __name__ == "__main__":
-    pytest.main([__file__, "-v", "--tb=short"])
+        assert stats["suggested_total"] == 1
+        assert stats["rejected_total"] == 1
+        assert stats["suggested_by_category"]["films"] == 1
+        assert stats["rejected_by_category"]["albums"] == 1
@@ -7,17 +7,35 @@ gefunden wurden. Jeder Künstler wird maximal einmal pro Jahr überprüft.
 """
 
 import os
+import sys
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
-from collections import Counter
-from utils.io import DATA_DIR
+import time
+import heapq
+import functools
+from contextlib import contextmanager
+from operator import itemgetter
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Set, Tuple
+from collections import Counter, defaultdict
+from utils.io import DATA_DIR, load_json, save_json
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 ARTIST_BLACKLIST_FILE: str = os.path.join(DATA_DIR, "blacklist_artists.json")
 RECHECK_INTERVAL_DAYS: int = 365  # 1 Jahr
+SECONDS_PER_DAY: int = 86400
+RECHECK_INTERVAL_SECONDS: int = RECHECK_INTERVAL_DAYS * SECONDS_PER_DAY
+
+
+def _artist_key(artist_name: str) -> str:
+    """
+    Bildet den internierten Blacklist-Schlüssel zu einem Künstlernamen.
+
+    Internierte Schlüssel teilen sich ein String-Objekt, Dict-Vergleiche
+    enden dann meist schon beim Identitätsvergleich.
+    """
+    return sys.intern(artist_name.lower().strip())
 
 
 class ArtistBlacklist:
@@ -39,6 +57,8 @@ class ArtistBlacklist:
     def __init__(self) -> None:
         """Initialisiert ArtistBlacklist und lädt existierende Daten."""
         self.blacklist: Dict[str, Dict[str, Any]] = self._load_blacklist()
+        self._batch_depth: int = 0
+        self._dirty: bool = False
         logger.info(f"Artist-Blacklist initialisiert mit {len(self.blacklist)} Einträgen")
 
     def _load_blacklist(self) -> Dict[str, Dict[str, Any]]:
@@ -50,8 +70,13 @@ class ArtistBlacklist:
         """
         if os.path.exists(ARTIST_BLACKLIST_FILE):
             try:
-                with open(ARTIST_BLACKLIST_FILE, "r", encoding="utf-8") as f:
-                    data: Dict[str, Dict[str, Any]] = json.load(f)
+                data: Dict[str, Dict[str, Any]] = {
+                    sys.intern(key): entry for key, entry in load_json(ARTIST_BLACKLIST_FILE).items()
+                }
+                # Ältere Dateien kennen nur die ISO-Strings: Zeitstempel einmalig ergänzen
+                for entry in data.values():
+                    self._entry_ts(entry, "last_checked")
+                    self._entry_ts(entry, "added_at")
                 logger.info(f"{len(data)} geblacklistete Künstler aus " f"{ARTIST_BLACKLIST_FILE} geladen")
                 return data
             except (json.JSONDecodeError, IOError) as e:
@@ -65,47 +90,146 @@ class ArtistBlacklist:
         """Speichert die Artist-Blacklist in die JSON-Datei."""
         try:
             os.makedirs(DATA_DIR, exist_ok=True)
-            with open(ARTIST_BLACKLIST_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.blacklist, f, ensure_ascii=False, indent=2)
+            save_json(ARTIST_BLACKLIST_FILE, self.blacklist)
             logger.info(f"{len(self.blacklist)} geblacklistete Künstler in " f"{ARTIST_BLACKLIST_FILE} gespeichert")
-        except IOError as e:
+        except (OSError, TypeError) as e:
             logger.error(f"Fehler beim Speichern von {ARTIST_BLACKLIST_FILE}: {e}")
 
-    def is_blacklisted(self, artist_name: str) -> bool:
+    @staticmethod
+    def _entry_ts(entry: Dict[str, Any], field: str) -> Optional[int]:
+        """
+        Gibt ein Datumsfeld eines Eintrags als Unix-Zeitstempel (Sekunden) zurück.
+
+        Der ISO-String wird nur einmal geparst und als "<field>_ts" am Eintrag
+        abgelegt; ältere Dateien und direkt gesetzte Einträge werden so
+        lazy migriert.
+
+        Args:
+            entry: Blacklist-Eintrag
+            field: Name des ISO-Datumsfelds ("last_checked" oder "added_at")
+
+        Returns:
+            Zeitstempel oder None bei fehlendem/ungültigem Datum
+        """
+        ts_field: str = f"{field}_ts"
+        ts: Optional[int] = entry.get(ts_field)
+        if ts is None:
+            try:
+                ts = int(datetime.fromisoformat(entry.get(field, "")).timestamp())
+            except (ValueError, TypeError):
+                return None
+            entry[ts_field] = ts
+        return ts
+
+    def _maybe_save(self) -> None:
+        """Speichert sofort, innerhalb von batch() erst beim Verlassen."""
+        self._dirty = True
+        if self._batch_depth == 0:
+            self._save_blacklist()
+            self._dirty = False
+
+    @contextmanager
+    def batch(self) -> Iterator["ArtistBlacklist"]:
+        """
+        Fasst mehrere Änderungen zu einem einzigen Schreibvorgang zusammen.
+
+        Beispiel:
+            with blacklist.batch():
+                for artist, count in artists:
+                    blacklist.add_to_blacklist(artist, count)
+
+        Yields:
+            Die ArtistBlacklist-Instanz selbst
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self._save_blacklist()
+                self._dirty = False
+
+    def is_blacklisted(self, artist_name: str, now_ts: Optional[int] = None) -> bool:
         """
         Prüft, ob ein Künstler auf der Blacklist steht.
 
         Args:
             artist_name: Name des Künstlers
+            now_ts: Aktueller Unix-Zeitstempel (default: time.time()),
+                erlaubt Aufrufern mit vielen Prüfungen eine gemeinsame Uhrzeit
 
         Returns:
             True wenn geblacklistet und letzter Check < 1 Jahr her, sonst False
         """
-        artist_key: str = artist_name.lower().strip()
+        artist_key: str = _artist_key(artist_name)
 
-        if artist_key not in self.blacklist:
+        # Ein einziger Dict-Zugriff statt "in" plus Indexzugriff
+        entry: Optional[Dict[str, Any]] = self.blacklist.get(artist_key)
+        if entry is None:
             return False
 
         # Prüfe, ob Re-Check fällig ist
-        last_check_str: str = self.blacklist[artist_key].get("last_checked", "")
+        last_check_ts: Optional[int] = self._entry_ts(entry, "last_checked")
 
-        try:
-            last_check: datetime = datetime.fromisoformat(last_check_str)
-            days_since_check: int = (datetime.now() - last_check).days
+        if last_check_ts is None:
+            logger.warning(f"Ungültiges Datum für '{artist_name}': {entry.get('last_checked', '')}")
+            return False  # Bei ungültigem Datum neu checken
 
-            if days_since_check >= RECHECK_INTERVAL_DAYS:
-                logger.info(f"Re-Check fällig für '{artist_name}': " f"{days_since_check} Tage seit letztem Check")
-                return False  # Re-Check durchführen
+        if now_ts is None:
+            now_ts = int(time.time())
+        # Vergleich in Sekunden, Tage werden nur für die Log-Ausgabe berechnet
+        seconds_since_check: int = now_ts - last_check_ts
 
-            logger.debug(f"'{artist_name}' auf Blacklist, " f"{days_since_check} Tage seit letztem Check")
-            return True
+        if seconds_since_check >= RECHECK_INTERVAL_SECONDS:
+            logger.info(
+                f"Re-Check fällig für '{artist_name}': " f"{seconds_since_check // SECONDS_PER_DAY} Tage seit letztem Check"
+            )
+            return False  # Re-Check durchführen
 
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Ungültiges Datum für '{artist_name}': {last_check_str}. " f"Fehler: {e}")
-            return False  # Bei ungültigem Datum neu checken
+        # Lazy formatiert: is_blacklisted liegt im Filterpfad, Debug ist meist aus
+        logger.debug("'%s' auf Blacklist, %d Tage seit letztem Check", artist_name, seconds_since_check // SECONDS_PER_DAY)
+        return True
+
+    def filter_names(self, names: Iterable[str]) -> Set[str]:
+        """
+        Gibt die Namen zurück, die nicht (mehr) auf der Blacklist stehen.
+
+        Namen ohne Blacklist-Eintrag werden per Set-Differenz in einem Schritt
+        aussortiert, nur die wenigen Treffer durchlaufen is_blacklisted()
+        mit der Re-Check-Prüfung.
+
+        Args:
+            names: Künstlernamen in beliebiger Schreibweise
+
+        Returns:
+            Set der übergebenen Namen (Original-Schreibweise), die nicht
+            geblacklistet sind
+        """
+        # Mehrere Schreibweisen können auf denselben Key fallen
+        names_by_key: Dict[str, List[str]] = defaultdict(list)
+        for name in names:
+            names_by_key[_artist_key(name)].append(name)
+
+        # Schnellpfad: Keys ohne Eintrag sind nie geblacklistet
+        survivors: Set[str] = set()
+        for key in names_by_key.keys() - self.blacklist.keys():
+            survivors.update(names_by_key[key])
+
+        # Einträge vorhanden: Re-Check-Intervall berücksichtigen, Uhrzeit einmal lesen
+        now_ts: int = int(time.time())
+        for key in names_by_key.keys() & self.blacklist.keys():
+            if not self.is_blacklisted(names_by_key[key][0], now_ts=now_ts):
+                survivors.update(names_by_key[key])
+
+        return survivors
 
     def add_to_blacklist(
-        self, artist_name: str, song_count: int, reason: str = "Keine neuen CDs in Bibliothek gefunden"
+        self,
+        artist_name: str,
+        song_count: int,
+        reason: str = "Keine neuen CDs in Bibliothek gefunden",
+        now: Optional[datetime] = None,
     ) -> None:
         """
         Fügt einen Künstler zur Blacklist hinzu.
@@ -114,27 +238,51 @@ class ArtistBlacklist:
             artist_name: Name des Künstlers
             song_count: Anzahl Songs im MP3-Archiv
             reason: Grund für die Blacklistung
+            now: Zeitpunkt des Checks (default: datetime.now())
         """
-        artist_key: str = artist_name.lower().strip()
+        artist_key: str = _artist_key(artist_name)
+
+        if now is None:
+            now = datetime.now()
+        now_iso: str = now.isoformat()
+        now_ts: int = int(now.timestamp())
 
         if artist_key in self.blacklist:
             logger.debug(f"'{artist_name}' ist bereits geblacklistet")
             # Aktualisiere Datum
-            self.blacklist[artist_key]["last_checked"] = datetime.now().isoformat()
-            self.blacklist[artist_key]["check_count"] = self.blacklist[artist_key].get("check_count", 1) + 1
+            entry: Dict[str, Any] = self.blacklist[artist_key]
+            entry["last_checked"] = now_iso
+            entry["last_checked_ts"] = now_ts
+            entry["check_count"] = entry.get("check_count", 1) + 1
         else:
             # Neuer Eintrag
             self.blacklist[artist_key] = {
                 "artist_name": artist_name,  # Original-Schreibweise
                 "song_count": song_count,
                 "reason": reason,
-                "added_at": datetime.now().isoformat(),
-                "last_checked": datetime.now().isoformat(),
+                "added_at": now_iso,
+                "added_at_ts": now_ts,
+                "last_checked": now_iso,
+                "last_checked_ts": now_ts,
                 "check_count": 1,
             }
             logger.info(f"✅ '{artist_name}' zur Artist-Blacklist hinzugefügt: {reason}")
 
-        self._save_blacklist()
+        self._maybe_save()
+
+    def bulk_add(self, entries: Iterable[Tuple[str, int, str]]) -> None:
+        """
+        Fügt mehrere Künstler mit gemeinsamem Zeitstempel hinzu.
+
+        Die Uhrzeit wird einmal gelesen und die Datei nur einmal geschrieben.
+
+        Args:
+            entries: Tupel aus (artist_name, song_count, reason)
+        """
+        now: datetime = datetime.now()
+        with self.batch():
+            for artist_name, song_count, reason in entries:
+                self.add_to_blacklist(artist_name, song_count, reason, now=now)
 
     def remove_from_blacklist(self, artist_name: str) -> bool:
         """
@@ -146,11 +294,11 @@ class ArtistBlacklist:
         Returns:
             True wenn entfernt, False wenn nicht gefunden
         """
-        artist_key: str = artist_name.lower().strip()
+        artist_key: str = _artist_key(artist_name)
 
         if artist_key in self.blacklist:
             del self.blacklist[artist_key]
-            self._save_blacklist()
+            self._maybe_save()
             logger.info(f"✅ '{artist_name}' von Artist-Blacklist entfernt")
             return True
 
@@ -166,25 +314,30 @@ class ArtistBlacklist:
         """
         due_artists: List[Dict[str, Any]] = []
 
-        for artist_key, data in self.blacklist.items():
-            last_check_str: str = data.get("last_checked", "")
-
-            try:
-                last_check: datetime = datetime.fromisoformat(last_check_str)
-                days_since_check: int = (datetime.now() - last_check).days
-
-                if days_since_check >= RECHECK_INTERVAL_DAYS:
-                    artist_info: Dict[str, Any] = {
-                        "artist_name": data["artist_name"],
-                        "days_since_check": days_since_check,
-                        "last_checked": last_check_str,
-                        "check_count": data.get("check_count", 1),
-                        "song_count": data.get("song_count", 0),
-                    }
-                    due_artists.append(artist_info)
+        # Einmal pro Durchlauf berechnen, danach nur Integer-Vergleiche
+        now_ts: int = int(time.time())
+        cutoff_ts: int = now_ts - RECHECK_INTERVAL_SECONDS
 
-            except (ValueError, TypeError):
-                logger.warning(f"Ungültiges Datum für '{data.get('artist_name', 'Unknown')}': " f"{last_check_str}")
+        for artist_key, data in self.blacklist.items():
+            last_check_ts: Optional[int] = self._entry_ts(data, "last_checked")
+
+            if last_check_ts is None:
+                logger.warning(
+                    f"Ungültiges Datum für '{data.get('artist_name', 'Unknown')}': " f"{data.get('last_checked', '')}"
+                )
+                continue
+
+            if last_check_ts > cutoff_ts:
+                continue
+
+            artist_info: Dict[str, Any] = {
+                "artist_name": data["artist_name"],
+                "days_since_check": (now_ts - last_check_ts) // SECONDS_PER_DAY,
+                "last_checked": data.get("last_checked", ""),
+                "check_count": data.get("check_count", 1),
+                "song_count": data.get("song_count", 0),
+            }
+            due_artists.append(artist_info)
 
         logger.info(f"{len(due_artists)} Künstler fällig für Re-Check")
         return due_artists
@@ -206,28 +359,27 @@ class ArtistBlacklist:
                 "most_checked": [],
             }
 
-        # Zähle Re-Check fällige Künstler
-        due_count: int = len(self.get_artists_due_for_recheck())
-
-        # Zähle kürzliche Additions (letzte 30 Tage)
+        # Ein Durchlauf für fällige Re-Checks und kürzliche Additions (letzte 30 Tage)
+        now_ts: int = int(time.time())
+        recheck_cutoff_ts: int = now_ts - RECHECK_INTERVAL_SECONDS
+        thirty_days_ago_ts: int = now_ts - 30 * SECONDS_PER_DAY
+        due_count: int = 0
         recent_additions: int = 0
-        thirty_days_ago: datetime = datetime.now() - timedelta(days=30)
+        check_counts: List[Tuple[str, int]] = []
 
         for data in self.blacklist.values():
-            added_at_str: str = data.get("added_at", "")
-            try:
-                added_at: datetime = datetime.fromisoformat(added_at_str)
-                if added_at >= thirty_days_ago:
-                    recent_additions += 1
-            except (ValueError, TypeError):
-                pass
+            last_check_ts: Optional[int] = self._entry_ts(data, "last_checked")
+            if last_check_ts is not None and last_check_ts <= recheck_cutoff_ts:
+                due_count += 1
+
+            added_at_ts: Optional[int] = self._entry_ts(data, "added_at")
+            if added_at_ts is not None and added_at_ts >= thirty_days_ago_ts:
+                recent_additions += 1
+
+            check_counts.append((data["artist_name"], data.get("check_count", 1)))
 
         # Top 5 meistgeprüfte Künstler
-        most_checked: List[Tuple[str, int]] = sorted(
-            [(data["artist_name"], data.get("check_count", 1)) for data in self.blacklist.values()],
-            key=lambda x: x[1],
-            reverse=True,
-        )[:5]
+        most_checked: List[Tuple[str, int]] = heapq.nlargest(5, check_counts, key=itemgetter(1))
 
         stats: Dict[str, Any] = {
             "total_artists": total_artists,
@@ -266,21 +418,18 @@ class ArtistBlacklist:
         Returns:
             Anzahl entfernter Einträge
         """
-        cutoff_date: datetime = datetime.now() - timedelta(days=days)
+        cutoff_ts: int = int(time.time()) - days * SECONDS_PER_DAY
         removed_count: int = 0
 
         artists_to_remove: List[str] = []
 
         for artist_key, data in self.blacklist.items():
-            added_at_str: str = data.get("added_at", "")
-
-            try:
-                added_at: datetime = datetime.fromisoformat(added_at_str)
-                if added_at < cutoff_date:
-                    artists_to_remove.append(artist_key)
+            added_at_ts: Optional[int] = self._entry_ts(data, "added_at")
 
-            except (ValueError, TypeError):
+            if added_at_ts is None:
                 logger.warning(f"Ungültiges Datum für '{data.get('artist_name', 'Unknown')}'")
+            elif added_at_ts < cutoff_ts:
+                artists_to_remove.append(artist_key)
 
         # Entferne alte Einträge
         for artist_key in artists_to_remove:
@@ -290,7 +439,7 @@ class ArtistBlacklist:
             logger.info(f"Alter Eintrag entfernt: '{artist_name}'")
 
         if removed_count > 0:
-            self._save_blacklist()
+            self._maybe_save()
             logger.info(f"{removed_count} alte Einträge (>{days} Tage) entfernt")
 
         return removed_count
@@ -327,12 +476,17 @@ def get_filtered_top_artists(
     checked_count: int = 0
     skipped_count: int = 0
 
+    candidates: List[Tuple[str, int]] = artist_counter.most_common(max_total)
+
+    # Blacklist-Prüfung für alle Kandidaten in einem Aufruf
+    allowed: Set[str] = artist_blacklist.filter_names(artist_name for artist_name, _ in candidates)
+
     # Iteriere über alle Künstler nach Häufigkeit sortiert
-    for artist_name, song_count in artist_counter.most_common(max_total):
+    for artist_name, song_count in candidates:
         checked_count += 1
 
         # Prüfe ob auf Blacklist
-        if artist_blacklist.is_blacklisted(artist_name):
+        if artist_name not in allowed:
             logger.debug(f"Überspringe '{artist_name}' (geblacklistet, " f"{song_count} Songs)")
             skipped_count += 1
             continue
@@ -364,8 +518,8 @@ def update_artist_blacklist_from_search_results(
     """
     if found_new_albums:
         # Neue Alben gefunden - von Blacklist entfernen falls vorhanden
-        if artist_blacklist.is_blacklisted(artist_name):
-            artist_blacklist.remove_from_blacklist(artist_name)
+        # (auch fällige Einträge, ein einziger Lookup)
+        if artist_blacklist.remove_from_blacklist(artist_name):
             logger.info(f"🎉 '{artist_name}' von Blacklist entfernt - " f"neue Alben gefunden!")
     else:
         # Keine neuen Alben - auf Blacklist setzen
@@ -373,19 +527,17 @@ def update_artist_blacklist_from_search_results(
         logger.info(f"⚫ '{artist_name}' auf Blacklist gesetzt - " f"keine neuen Alben verfügbar")
 
 
-# Globale Artist-Blacklist-Instanz (Singleton)
-_artist_blacklist_instance: Optional[ArtistBlacklist] = None
-
-
+@functools.lru_cache(maxsize=1)
 def get_artist_blacklist() -> ArtistBlacklist:
     """
     Gibt die globale Artist-Blacklist-Instanz zurück (Singleton-Pattern).
 
+    Die Instanz wird beim ersten Aufruf erstellt und zwischengespeichert.
+    get_artist_blacklist.cache_clear() erzwingt ein Neuladen.
+
     Returns:
         Die globale ArtistBlacklist-Instanz
     """
-    global _artist_blacklist_instance
-    if _artist_blacklist_instance is None:
-        _artist_blacklist_instance = ArtistBlacklist()
-        logger.info("Neue Artist-Blacklist-Instanz erstellt")
-    return _artist_blacklist_instance
+    instance = ArtistBlacklist()
+    logger.info("Neue Artist-Blacklist-Instanz erstellt")
+    return instance
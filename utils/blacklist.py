@@ -8,10 +8,12 @@ auf die Blacklist gesetzt.
 """
 
 import os
+import sys
 import json
+import functools
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-from utils.io import DATA_DIR
+from typing import Dict, List, Any, Optional, Set
+from utils.io import DATA_DIR, load_json, save_json
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -23,6 +25,11 @@ BLACKLIST_FILES: Dict[str, str] = {
 }
 
 
+def _index_key(text: str) -> str:
+    """Normalisiert Titel bzw. Autor für den Index, internierte Strings sparen Speicher."""
+    return sys.intern(text.lower().strip())
+
+
 class Blacklist:
     """
     Verwaltet Blacklists für Medien, die in der Bibliothek nicht existieren.
@@ -35,14 +42,50 @@ class Blacklist:
     """
 
     def __init__(self) -> None:
-        """Initialisiert Blacklist und lädt existierende Listen."""
-        self.blacklists: Dict[str, List[Dict[str, Any]]] = {
-            "films": self._load_blacklist("films"),
-            "albums": self._load_blacklist("albums"),
-            "books": self._load_blacklist("books"),
-        }
+        """Initialisiert Blacklist, die Listen werden erst bei Bedarf geladen."""
+        # Geladene Kategorien; eine Kategorie wird beim ersten Zugriff über
+        # _category() eingelesen, ungenutzte Kategorien kosten nichts
+        self._blacklists: Dict[str, List[Dict[str, Any]]] = {}
+        # Index pro Kategorie: normalisierter Titel -> normalisierte Autoren
+        # ("" für Einträge ohne Autor); is_blacklisted braucht so keinen Listen-Scan
+        self._title_index: Dict[str, Dict[str, Set[str]]] = {}
         logger.info("Blacklist-System initialisiert")
 
+    @property
+    def blacklists(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Alle Kategorien mit ihren Einträgen, noch nicht geladene werden nachgeladen."""
+        for category in BLACKLIST_FILES:
+            self._category(category)
+        return self._blacklists
+
+    def _category(self, category: str) -> List[Dict[str, Any]]:
+        """
+        Gibt die Einträge einer Kategorie zurück und lädt sie beim ersten Zugriff.
+
+        Args:
+            category: Kategorie ('films', 'albums', 'books')
+
+        Returns:
+            Liste der geblacklisteten Medien
+        """
+        entries: Optional[List[Dict[str, Any]]] = self._blacklists.get(category)
+        if entries is None:
+            entries = self._blacklists[category] = self._load_blacklist(category)
+            self._rebuild_title_index(category)
+        return entries
+
+    def _rebuild_title_index(self, category: str) -> None:
+        """
+        Baut den Titel-Index für eine Kategorie neu auf.
+
+        Args:
+            category: Kategorie ('films', 'albums', 'books')
+        """
+        index: Dict[str, Set[str]] = {}
+        for bl in self._blacklists[category]:
+            index.setdefault(_index_key(bl["title"]), set()).add(_index_key(bl.get("author") or ""))
+        self._title_index[category] = index
+
     def _load_blacklist(self, category: str) -> List[Dict[str, Any]]:
         """
         Lädt die Blacklist für eine Kategorie aus der JSON-Datei.
@@ -60,8 +103,7 @@ class Blacklist:
 
         if os.path.exists(filepath):
             try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    data: List[Dict[str, Any]] = json.load(f)
+                data: List[Dict[str, Any]] = load_json(filepath)
                 logger.info(f"{len(data)} geblacklistete {category} geladen")
                 return data
             except (json.JSONDecodeError, IOError) as e:
@@ -85,10 +127,9 @@ class Blacklist:
 
         try:
             os.makedirs(DATA_DIR, exist_ok=True)
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(self.blacklists[category], f, ensure_ascii=False, indent=2)
-            logger.info(f"{len(self.blacklists[category])} {category} " f"in Blacklist gespeichert")
-        except IOError as e:
+            save_json(filepath, self._blacklists[category])
+            logger.info(f"{len(self._blacklists[category])} {category} " f"in Blacklist gespeichert")
+        except (OSError, TypeError) as e:
             logger.error(f"Fehler beim Speichern von {filepath}: {e}")
 
     def is_blacklisted(self, category: str, item: Dict[str, Any]) -> bool:
@@ -102,27 +143,21 @@ class Blacklist:
         Returns:
             True wenn geblacklistet, sonst False
         """
-        if category not in self.blacklists:
+        if category not in BLACKLIST_FILES:
             logger.warning(f"Unbekannte Kategorie '{category}'")
             return False
 
-        title_lower: str = item["title"].lower().strip()
-        author_lower: str = item.get("author", "").lower().strip()
-
-        for blacklisted in self.blacklists[category]:
-            bl_title: str = blacklisted["title"].lower().strip()
-            bl_author: str = blacklisted.get("author", "").lower().strip()
+        # Häufigster Fall "nicht geblacklistet": Titel nicht im Index
+        self._category(category)
+        authors: Optional[Set[str]] = self._title_index[category].get(item["title"].lower().strip())
+        if authors is None:
+            return False
 
-            # Vergleiche Titel und Autor
-            if bl_title == title_lower:
-                # Wenn kein Autor vorhanden, nur Titel vergleichen
-                if not author_lower or not bl_author:
-                    return True
-                # Wenn beide Autoren vorhanden, beide vergleichen
-                if bl_author == author_lower:
-                    return True
+        author_lower: str = item.get("author", "").lower().strip()
 
-        return False
+        # Wenn auf einer Seite kein Autor vorhanden ist, genügt der Titel,
+        # sonst müssen beide Autoren übereinstimmen
+        return not author_lower or "" in authors or author_lower in authors
 
     def add_to_blacklist(self, category: str, item: Dict[str, Any], reason: str = "Nicht in Bibliothek gefunden") -> None:
         """
@@ -133,7 +168,7 @@ class Blacklist:
             item: Medium mit 'title' und optional 'author'
             reason: Grund für die Blacklistung
         """
-        if category not in self.blacklists:
+        if category not in BLACKLIST_FILES:
             logger.warning(f"Unbekannte Kategorie '{category}'")
             return
 
@@ -151,7 +186,10 @@ class Blacklist:
             "added_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         }
 
-        self.blacklists[category].append(blacklist_entry)
+        self._category(category).append(blacklist_entry)
+        self._title_index[category].setdefault(_index_key(blacklist_entry["title"]), set()).add(
+            _index_key(blacklist_entry["author"])
+        )
         self._save_blacklist(category)
 
         logger.info(f"✅ '{item['title']}' zur {category}-Blacklist hinzugefügt: {reason}")
@@ -167,28 +205,41 @@ class Blacklist:
         Returns:
             True wenn entfernt, False wenn nicht gefunden
         """
-        if category not in self.blacklists:
+        if category not in BLACKLIST_FILES:
             logger.warning(f"Unbekannte Kategorie '{category}'")
             return False
 
         title_lower: str = item["title"].lower().strip()
         author_lower: str = item.get("author", "").lower().strip()
 
-        original_length: int = len(self.blacklists[category])
+        # Titel nicht im Index: nichts zu entfernen, Listen-Scan sparen
+        entries: List[Dict[str, Any]] = self._category(category)
+        if title_lower not in self._title_index[category]:
+            logger.debug(f"'{item['title']}' nicht auf {category}-Blacklist gefunden")
+            return False
+
+        original_length: int = len(entries)
 
         # Filtere Blacklist
-        self.blacklists[category] = [
+        self._blacklists[category] = [
             bl
-            for bl in self.blacklists[category]
+            for bl in entries
             if not (
                 bl["title"].lower().strip() == title_lower
                 and (not author_lower or not bl.get("author") or bl.get("author", "").lower().strip() == author_lower)
             )
         ]
 
-        removed: bool = original_length > len(self.blacklists[category])
+        removed: bool = original_length > len(self._blacklists[category])
 
         if removed:
+            # Index gezielt nachführen: ohne Autor fallen alle Einträge des Titels weg,
+            # sonst die Einträge ohne Autor und die mit passendem Autor
+            authors: Set[str] = self._title_index[category][title_lower]
+            if author_lower:
+                authors -= {"", author_lower}
+            if not author_lower or not authors:
+                del self._title_index[category][title_lower]
             self._save_blacklist(category)
             logger.info(f"✅ '{item['title']}' von {category}-Blacklist entfernt")
 
@@ -202,15 +253,17 @@ class Blacklist:
             category: Spezifische Kategorie oder None für alle
         """
         if category:
-            if category in self.blacklists:
-                self.blacklists[category] = []
+            if category in BLACKLIST_FILES:
+                self._blacklists[category] = []
+                self._title_index[category] = {}
                 self._save_blacklist(category)
                 logger.info(f"✅ {category}-Blacklist gelöscht")
             else:
                 logger.warning(f"Unbekannte Kategorie '{category}'")
         else:
-            for cat in self.blacklists.keys():
-                self.blacklists[cat] = []
+            for cat in BLACKLIST_FILES:
+                self._blacklists[cat] = []
+                self._title_index[cat] = {}
                 self._save_blacklist(cat)
             logger.info("✅ Alle Blacklists gelöscht")
 
@@ -251,19 +304,18 @@ class Blacklist:
         print("=" * 50 + "\n")
 
 
-# Globale Blacklist-Instanz (Singleton)
-_blacklist_instance: Optional[Blacklist] = None
-
-
+@functools.lru_cache(maxsize=1)
 def get_blacklist() -> Blacklist:
     """
     Gibt die globale Blacklist-Instanz zurück (Singleton-Pattern).
 
+    Die Instanz wird beim ersten Aufruf erstellt und zwischengespeichert,
+    die Blacklist-Dateien werden also nur einmal pro Prozess gelesen.
+    get_blacklist.cache_clear() erzwingt ein Neuladen.
+
     Returns:
         Die globale Blacklist-Instanz
     """
-    global _blacklist_instance
-    if _blacklist_instance is None:
-        _blacklist_instance = Blacklist()
-        logger.info("Neue Blacklist-Instanz erstellt")
-    return _blacklist_instance
+    instance = Blacklist()
+    logger.info("Neue Blacklist-Instanz erstellt")
+    return instance
@@ -9,6 +9,7 @@ wiederholte Suchanfragen bis das Medium zurückgegeben wurde.
 import os
 import json
 import re
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from utils.io import DATA_DIR
@@ -35,6 +36,8 @@ class BorrowedBlacklist:
     def __init__(self) -> None:
         """Initialisiert BorrowedBlacklist und lädt existierende Daten."""
         self.blacklist: Dict[str, Dict[str, Any]] = self._load_blacklist()
+        # Schützt Änderungen, wenn mehrere Kategorien parallel vorgeschlagen werden
+        self._lock = threading.RLock()
         logger.info(f"Entleih-Blacklist initialisiert mit {len(self.blacklist)} Einträgen")
 
     def _load_blacklist(self) -> Dict[str, Dict[str, Any]]:
@@ -61,7 +64,7 @@ class BorrowedBlacklist:
         """Speichert die Entleih-Blacklist in die JSON-Datei."""
         try:
             os.makedirs(DATA_DIR, exist_ok=True)
-            with open(BORROWED_BLACKLIST_FILE, "w", encoding="utf-8") as f:
+            with self._lock, open(BORROWED_BLACKLIST_FILE, "w", encoding="utf-8") as f:
                 json.dump(self.blacklist, f, ensure_ascii=False, indent=2)
             logger.info(f"{len(self.blacklist)} entliehene Medien in {BORROWED_BLACKLIST_FILE} gespeichert")
         except IOError as e:
@@ -113,9 +116,8 @@ class BorrowedBlacklist:
             year = match.group(3)
 
             try:
-                # Validiere Datum
-                date_obj = datetime.strptime(f"{day}/{month}/{year}", "%d/%m/%Y")
-                iso_date = date_obj.strftime("%Y-%m-%d")
+                # Validiere Datum (datetime() wirft ValueError bei ungültigen Tagen/Monaten)
+                iso_date = datetime(int(year), int(month), int(day)).date().isoformat()
                 logger.debug(f"Rückgabedatum extrahiert: {iso_date}")
                 return iso_date
             except ValueError as e:
@@ -151,7 +153,7 @@ class BorrowedBlacklist:
             return False
 
         try:
-            return_date = datetime.strptime(return_date_str, "%Y-%m-%d")
+            return_date = datetime.fromisoformat(return_date_str)
             today = datetime.now()
 
             if today >= return_date:
@@ -192,8 +194,8 @@ class BorrowedBlacklist:
         # Wenn bereits vorhanden, nutze früheres Datum
         if key in self.blacklist:
             existing_date_str = self.blacklist[key]["return_date"]
-            existing_date = datetime.strptime(existing_date_str, "%Y-%m-%d")
-            new_date = datetime.strptime(return_date, "%Y-%m-%d")
+            existing_date = datetime.fromisoformat(existing_date_str)
+            new_date = datetime.fromisoformat(return_date)
 
             if new_date < existing_date:
                 logger.info(f"Früheres Rückgabedatum für '{title}': {return_date}")
@@ -203,16 +205,16 @@ class BorrowedBlacklist:
                 return_date = existing_date_str
 
         # Erstelle/Update Eintrag
-        self.blacklist[key] = {
-            "title": title,
-            "author": author,
-            "media_type": media_type,
-            "return_date": return_date,
-            "added_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "availability_text": availability_text[:300],  # Gekürzt
-        }
-
-        self._save_blacklist()
+        with self._lock:
+            self.blacklist[key] = {
+                "title": title,
+                "author": author,
+                "media_type": media_type,
+                "return_date": return_date,
+                "added_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "availability_text": availability_text[:300],  # Gekürzt
+            }
+            self._save_blacklist()
         logger.info(f"📅 '{title}' auf Entleih-Blacklist bis {return_date}")
         return True
 
@@ -229,13 +231,14 @@ class BorrowedBlacklist:
         """
         key = self._create_key(title, author)
 
-        if key in self.blacklist:
+        with self._lock:
+            if key not in self.blacklist:
+                return False
             del self.blacklist[key]
             self._save_blacklist()
-            logger.info(f"✅ '{title}' von Entleih-Blacklist entfernt")
-            return True
 
-        return False
+        logger.info(f"✅ '{title}' von Entleih-Blacklist entfernt")
+        return True
 
     def cleanup_expired_entries(self) -> int:
         """
@@ -253,7 +256,7 @@ class BorrowedBlacklist:
             return_date_str = entry.get("return_date", "")
 
             try:
-                return_date = datetime.strptime(return_date_str, "%Y-%m-%d")
+                return_date = datetime.fromisoformat(return_date_str)
 
                 if today >= return_date:
                     to_remove.append(key)
@@ -297,7 +300,7 @@ class BorrowedBlacklist:
         for entry in self.blacklist.values():
             return_date_str = entry.get("return_date", "")
             try:
-                return_date = datetime.strptime(return_date_str, "%Y-%m-%d")
+                return_date = datetime.fromisoformat(return_date_str)
                 if today <= return_date <= week_later:
                     upcoming.append(
                         {"title": entry["title"], "return_date": return_date_str, "days_left": (return_date - today).days}
@@ -5,16 +5,95 @@ I/O-Utilities mit Type Hints und Logging
 
 import os
 import re
+import json
+import stat
+import tempfile
 from datetime import datetime
 from typing import Dict, List, Any, Tuple
 from collections import defaultdict
 from utils.logging_config import get_logger
 
+try:
+    import orjson
+except ImportError:  # optional, Fallback auf json aus der Standardbibliothek
+    orjson = None
+
 logger = get_logger(__name__)
 
 DATA_DIR: str = "data"
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# umask lässt sich nur durch Setzen auslesen; einmalig beim Import, da
+# save_json auch aus Hintergrund-Threads aufgerufen wird
+_UMASK: int = os.umask(0)
+os.umask(_UMASK)
+
+
+def load_json(path: str) -> Any:
+    """
+    Lädt eine JSON-Datei, mit orjson falls installiert.
+
+    Args:
+        path: Pfad zur JSON-Datei
+
+    Returns:
+        Geladene Daten
+
+    Raises:
+        OSError: Wenn die Datei nicht gelesen werden kann
+        json.JSONDecodeError: Bei ungültigem JSON (auch orjson.JSONDecodeError)
+    """
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(path: str, data: Any) -> None:
+    """
+    Speichert Daten als eingerückte UTF-8 JSON-Datei, mit orjson falls installiert.
+
+    Die Datei wird atomar ersetzt: Es wird zuerst eine temporäre Datei im
+    selben Verzeichnis geschrieben und auf die Platte gebracht, danach ersetzt
+    os.replace die Zieldatei. Ein Absturz während des Schreibens hinterlässt
+    so nie eine abgeschnittene Datei. Die Zugriffsrechte einer vorhandenen
+    Datei bleiben erhalten, neue Dateien erhalten die üblichen Rechte (0666 & ~umask).
+
+    Args:
+        path: Pfad zur JSON-Datei
+        data: Zu speichernde Daten
+
+    Raises:
+        OSError: Wenn die Datei nicht geschrieben werden kann
+        TypeError: Wenn die Daten nicht serialisierbar sind
+    """
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp legt die Datei mit 0600 an, os.replace würde das übernehmen
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 
 def extract_genres_from_availability(availability: str) -> List[str]:
     """
@@ -62,9 +62,10 @@ def get_source_emoji(source):
     Returns:
         str: Emoji oder leerer String
     """
-    # Exakte Übereinstimmung
-    if source in SOURCE_EMOJIS:
-        return SOURCE_EMOJIS[source]
+    # Exakte Übereinstimmung (ein einziger Dict-Zugriff)
+    emoji = SOURCE_EMOJIS.get(source)
+    if emoji is not None:
+        return emoji
 
     # Prüfe auf "Interessant für dich"
     if source and "Interessant für dich" in source: